@@ -0,0 +1,281 @@
+# Benchmark harness for the hashing, mining, Merkle, chain validation and RSA hot paths.
+#
+#   python benchmarks/run_benchmarks.py                      run everything, print a table
+#   python benchmarks/run_benchmarks.py --quick              smaller sizes, for a fast check
+#   python benchmarks/run_benchmarks.py --save base.json     store the results as a baseline
+#   python benchmarks/run_benchmarks.py --compare base.json  flag benchmarks slower than the baseline
+#   python benchmarks/run_benchmarks.py --filter merkle      only benchmarks whose name contains "merkle"
+#
+# Every benchmark reports ops/sec, latency percentiles (p50/p90/p99) and the peak memory
+# allocated by one call (measured with tracemalloc in a separate run, so timing is not slowed).
+# Mining benchmarks mine a fixed set of blocks per call and also report hashes/sec.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Make the mini_blockchain package importable when run as benchmarks/run_benchmarks.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mini_blockchain  # noqa: E402
+
+
+def load_module(name):
+    # Modules are loaded lazily by the package on first access
+    return getattr(mini_blockchain, name)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(name, func, min_time=1.0, min_runs=3, max_runs=100_000, setup=None):
+    """
+    Call func() repeatedly for at least min_time seconds (and min_runs calls) and return
+    its timing and memory statistics. func is called once more under tracemalloc.
+    setup (optional) runs untimed before every call, e.g. to drop caches func would hit.
+    """
+    setup = setup or (lambda: None)
+    setup()
+    func()  # Warm-up: first-call costs (imports, caches) are not part of the measurement
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_runs and (len(latencies) < min_runs or time.perf_counter() - started < min_time):
+        setup()
+        t0 = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = sum(latencies)
+
+    setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "name": name,
+        "runs": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed > 0 else float("inf"),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+# -------------------------
+# Benchmark definitions
+# -------------------------
+# Each suite yields (name, build) pairs. build() does the expensive preparation (large inputs,
+# chains, keys) and returns the zero-argument function to time, or a Benchmark when it also needs
+# an untimed setup or reports extra numbers. run() applies --filter before calling build(), so
+# filtered-out benchmarks cost nothing.
+
+class Benchmark:
+    def __init__(self, func, setup=None, report=None):
+        self.func = func
+        self.setup = setup  # Runs untimed before every call
+        self.report = report  # Returns extra result fields (e.g. hashes/sec) after the runs
+
+
+# Fixed block data mined by every proof_of_work run: the nonce work per run is the same on every
+# machine and in every run, so latencies can be compared against a saved baseline
+MINING_INPUTS = [f"Block {i}" for i in range(8)]
+
+
+def hashing_benchmarks(quick):
+    hashing_basics = load_module("hashing_basics")
+    for size in (64, 4096):
+        data = "x" * size
+        yield f"generate_hash[{size}B]", lambda data=data: lambda: hashing_basics.generate_hash(data)
+    count = 16 if quick else 64
+
+    def blobs():
+        return [bytes([i % 256]) * 64 * 1024 for i in range(count)]
+
+    yield f"hash_many[{count}x64KB]", lambda: lambda data=blobs(): hashing_basics.hash_many(data)
+    yield f"hash_stream[{count * 64}KB]", lambda: lambda data=b"".join(blobs()): hashing_basics.hash_stream(data)
+
+
+def mining_benchmarks(quick):
+    def build(difficulty):
+        pow_simulation = load_module("pow_simulation")
+        totals = {"hashes": 0, "duration": 0.0}
+
+        def mine_all():
+            for data in MINING_INPUTS:
+                stats = {}
+                pow_simulation.proof_of_work(data, difficulty, stats=stats)
+                if tracemalloc.is_tracing():
+                    continue  # The memory run is slowed by tracing: keep it out of the hash rate
+                totals["hashes"] += stats["hashes"]
+                totals["duration"] += stats["duration"]
+
+        def report():
+            duration = totals["duration"]
+            return {"hashes_per_sec": totals["hashes"] / duration if duration > 0 else float("inf")}
+
+        return Benchmark(mine_all, report=report)
+
+    for difficulty in ((2, 3) if quick else (2, 3, 4)):
+        yield (f"proof_of_work[difficulty={difficulty},blocks={len(MINING_INPUTS)}]",
+               lambda d=difficulty: build(d))
+
+
+def merkle_benchmarks(quick):
+    merkle_tree = load_module("merkle_tree")
+    merkle_proof = load_module("merkle_proof")
+    built = {}  # leaves -> transaction list, shared by the root and proof benchmarks of that size
+
+    def transactions(leaves):
+        if leaves not in built:
+            built.clear()  # Keep only one size alive: the largest list is a million strings
+            built[leaves] = [f"Tx{i}: Alice pays Bob {i} BTC" for i in range(leaves)]
+        return built[leaves]
+
+    for leaves in ((1_000, 10_000) if quick else (1_000, 10_000, 100_000, 1_000_000)):
+        yield (f"build_merkle_root[{leaves}]",
+               lambda n=leaves: lambda txs=transactions(n): merkle_tree.build_merkle_root(txs))
+        yield (f"get_merkle_proof[{leaves}]",
+               lambda n=leaves: lambda txs=transactions(n): merkle_proof.get_merkle_proof(txs, len(txs) // 2))
+
+
+def chain_benchmarks(quick):
+    merkle_tree = load_module("merkle_tree")
+
+    def build_chain(length):
+        chain = merkle_tree.Blockchain()
+        for i in range(length):
+            chain.add_block([f"Tx{i}"])
+        return chain
+
+    for length in ((1_000,) if quick else (1_000, 100_000)):
+        # Separate chains: add_block grows its chain, which must not change the validated length
+        yield (f"add_block[chain={length}]",
+               lambda n=length: lambda chain=build_chain(n): chain.add_block(["Alice pays Bob 1"]))
+        yield f"is_chain_valid[chain={length}]", lambda n=length: build_chain(n).is_chain_valid
+
+
+def rsa_benchmarks(quick):
+    try:
+        from cryptography.hazmat.primitives.asymmetric import rsa
+    except ImportError:
+        print("cryptography is not installed: skipping RSA benchmarks", file=sys.stderr)
+        return
+    material = {}  # Key pair, signature and ciphertext, generated by the first RSA benchmark that runs
+
+    def keys():
+        if not material:
+            signature_verifier = load_module("signature_verifier")
+            hybrid_encryption = load_module("hybrid_encryption")
+            pss, sha256 = signature_verifier.PSS_PADDING, signature_verifier.SIGNATURE_HASH
+            oaep = hybrid_encryption.OAEP_PADDING
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            public_key = private_key.public_key()
+            message = b"Blockchain Transaction: Alice pays Bob 10 BTC"
+            material.update(
+                private_key=private_key, public_key=public_key, message=message, pss=pss, sha256=sha256,
+                oaep=oaep, signature=private_key.sign(message, pss, sha256),
+                ciphertext=public_key.encrypt(message, oaep),
+            )
+        return material
+
+    def sign(k):
+        return lambda: k["private_key"].sign(k["message"], k["pss"], k["sha256"])
+
+    def verify(k):
+        return lambda: k["public_key"].verify(k["signature"], k["message"], k["pss"], k["sha256"])
+
+    def encrypt(k):
+        return lambda: k["public_key"].encrypt(k["message"], k["oaep"])
+
+    def decrypt(k):
+        return lambda: k["private_key"].decrypt(k["ciphertext"], k["oaep"])
+
+    yield "rsa_sign", lambda: sign(keys())
+    yield "rsa_verify", lambda: verify(keys())
+    yield "rsa_encrypt", lambda: encrypt(keys())
+    yield "rsa_decrypt", lambda: decrypt(keys())
+
+
+SUITES = [hashing_benchmarks, mining_benchmarks, merkle_benchmarks, chain_benchmarks, rsa_benchmarks]
+
+
+def run(quick=False, name_filter=None, min_time=1.0):
+    results = []
+    for suite in SUITES:
+        for name, build in suite(quick):
+            if name_filter and name_filter not in name:
+                continue  # Checked before build(), so skipped benchmarks never prepare their inputs
+            benchmark = build()
+            if not isinstance(benchmark, Benchmark):
+                benchmark = Benchmark(benchmark)
+            result = measure(name, benchmark.func, min_time=min_time, setup=benchmark.setup)
+            if benchmark.report is not None:
+                result.update(benchmark.report())
+            extra = "".join(f"  {key} {value:,.0f}" for key, value in result.items() if key == "hashes_per_sec")
+            print(f"{name:<34} {result['ops_per_sec']:>12.1f} ops/s  p50 {result['p50_ms']:>9.3f} ms  "
+                  f"p90 {result['p90_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+                  f"peak {result['peak_memory_kb']:>10.1f} KB{extra}")
+            results.append(result)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare ops/sec with a saved baseline; anything slower by more than threshold
+    (0.2 = 20%) is reported as a regression. Returns the list of regressed names.
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1.0
+        flag = "REGRESSION" if change < -threshold else ""
+        print(f"{result['name']:<34} {change:>+8.1%} {flag}")
+        if flag:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the blockchain hot paths")
+    parser.add_argument("--quick", action="store_true", help="smaller input sizes")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend per benchmark")
+    parser.add_argument("--save", help="write results to this JSON baseline file")
+    parser.add_argument("--compare", help="compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown (fraction of ops/sec) that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, name_filter=args.filter, min_time=args.min_time)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
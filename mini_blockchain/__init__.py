@@ -0,0 +1,70 @@
+"""
+Importable entry point for the weekly scripts.
+
+The code stays in the "week N" folders (their names contain spaces, so they cannot be
+packages themselves). This package puts those folders on sys.path and loads a module only
+when it is first accessed, so `import mini_blockchain` does no work at all:
+
+    import mini_blockchain
+    root = mini_blockchain.merkle_tree.build_merkle_root(["Alice pays Bob 10"])
+
+Each module is imported under its own top-level name (e.g. `merkle_tree`), the same way the
+scripts import each other, so there is only ever one copy of every module.
+Run a module's demo with `python -m mini_blockchain <module>`.
+"""
+import importlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module name -> folder it lives in
+MODULES = {
+    "blockchain": "week 1",
+    "chain_metrics": "week 2",
+    "hashing_basics": "week 2",
+    "hybrid_encryption": "week 2",
+    "keystore": "week 2",
+    "mini_cryptography_project": "week 2",
+    "packed_fields": "week 2",
+    "rsa_digital_sign": "week 2",
+    "rsa_encryption": "week 2",
+    "signature_verifier": "week 2",
+    "block_store": "week 3",
+    "block_structure": "week 3",
+    "ledger_state": "week 3",
+    "mempool": "week 3",
+    "merkle_proof": "week 3",
+    "merkle_tree": "week 3",
+    "transaction": "week 3",
+    "pos_simulation": "week 4",
+    "pow_simulation": "week 4",
+}
+
+__all__ = sorted(MODULES)
+
+
+def module_path(name):
+    # Path of the script that implements module `name`
+    return os.path.join(ROOT, MODULES[name], name + ".py")
+
+
+def _add_week_folders():
+    # Appended, not prepended: the week modules never shadow installed or standard modules
+    for week in sorted(set(MODULES.values())):
+        folder = os.path.join(ROOT, week)
+        if folder not in sys.path:
+            sys.path.append(folder)
+
+
+def __getattr__(name):
+    if name not in MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _add_week_folders()
+    module = importlib.import_module(name)
+    globals()[name] = module  # Later accesses skip __getattr__
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))
@@ -0,0 +1,21 @@
+# python -m mini_blockchain <module>: run that module's demo (its __main__ section)
+import runpy
+import sys
+
+import mini_blockchain
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in mini_blockchain.MODULES:
+        print("usage: python -m mini_blockchain <module>")
+        print("modules:", ", ".join(mini_blockchain.__all__))
+        return 2
+
+    mini_blockchain._add_week_folders()
+    runpy.run_path(mini_blockchain.module_path(argv[0]), run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
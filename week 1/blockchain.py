@@ -1,10 +1,23 @@
-import hashlib  # built-in library for creating cryptographic hashes (SHA-256)
+import os       # used to locate the week 2 folder
+import sys      # used to make the week 2 folder importable
 import time     # used to timestamp blocks when they are created
 
+# The shared SHA-256 helpers (generate_hash) and the packed field storage live in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+from hashing_basics import generate_hash  # noqa: E402
+from packed_fields import DIGEST, FLOAT, INT, PackedFields  # noqa: E402
+
 # -------------------------
 # Block class: represents one block in the blockchain
 # -------------------------
-class Block:
+class Block(PackedFields):
+    # index, timestamp and both hashes are kept in one packed 88-byte record (hashes as raw
+    # 32-byte digests) instead of four separate Python objects, and __slots__ drops the
+    # per-block __dict__: a block's own overhead (everything but its data) shrinks from
+    # about 280 to about 170 bytes, which adds up when a chain holds millions of blocks
+    PACKED_FIELDS = (("index", INT), ("timestamp", FLOAT), ("previous_hash", DIGEST), ("hash", DIGEST))
+    __slots__ = ("data",)
+
     def __init__(self, index, data, previous_hash):
         """
         Initialize a block.
@@ -12,25 +25,34 @@ class Block:
         data: the transactions or payload stored in this block
         previous_hash: the hash string of the previous block (links blocks together)
         """
-        self.index = index
         # timestamp lets us know when this block was created; included in the hash so time affects block identity
-        self.timestamp = time.time()
+        timestamp = time.time()
         self.data = data
-        # previous_hash links this block to the chain; without it blocks wouldn't be chained
-        self.previous_hash = previous_hash
-        # calculate and save this block's hash immediately so we have a recorded fingerprint
+        # previous_hash links this block to the chain; without it blocks wouldn't be chained.
+        # The hash is calculated and saved immediately so we have a recorded fingerprint
         # (this is used later to detect tampering)
-        self.hash = self.calculate_hash()
+        digest = generate_hash(self._header(index, timestamp, data, previous_hash), raw=True)
+        self._pack(index, timestamp, previous_hash, digest)
+
+    @staticmethod
+    def _header(index, timestamp, data, previous_hash):
+        # create a string representation of the block contents that should be hashed
+        return f"{index}{timestamp}{data}{previous_hash}".encode()
+
+    def header_bytes(self):
+        """
+        The exact bytes that are hashed: index, timestamp, data and previous_hash joined together.
+        Built on demand from the packed fields, so a block does not carry a second copy of its data.
+        """
+        return self._header(self.index, self.timestamp, self.data, self.previous_hash)
 
     def calculate_hash(self):
         """
         Combine the block's important fields into a single string and hash it.
         We include index, timestamp, data, and previous_hash so that any change to them changes the hash.
         """
-        # create a string representation of the block contents that should be hashed
-        block_string = f"{self.index}{self.timestamp}{self.data}{self.previous_hash}"
-        # compute SHA-256 hash of the string and return it as a readable hex string
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        # compute SHA-256 hash of the header bytes and return it as a readable hex string
+        return generate_hash(self.header_bytes())
 
 # -------------------------
 # Blockchain class: manages the chain of blocks
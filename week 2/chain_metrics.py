@@ -0,0 +1,319 @@
+# Low-overhead counters, histograms and timers for the mining, Merkle, validation and signature paths.
+#
+# Recording is off by default. Hot paths only test the module-level ENABLED flag and record
+# once per operation (one Merkle root, one mining run, one validation), never once per hash,
+# so leaving metrics disabled costs a single attribute check per operation.
+#
+#   import chain_metrics
+#   chain_metrics.enable()                 # or set MINI_BLOCKCHAIN_METRICS=1 before starting
+#   ... mine, build blocks, validate ...
+#   print(chain_metrics.to_prometheus())   # Prometheus text format (or to_json())
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("MINI_BLOCKCHAIN_METRICS", "") not in ("", "0")
+
+# Prefix of every exported metric name
+NAMESPACE = "mini_blockchain"
+
+# Upper bounds (seconds) of the histogram buckets used by timers
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# Metrics recorded by the modules, with their Prometheus help text.
+# Names ending in _total are counters, names ending in _seconds are histograms.
+METRICS = {
+    "hashes_total": "SHA-256 hashes computed by Merkle builders, batch hashing and proof of work",
+    "nonces_tried_total": "Proof-of-work nonces tried",
+    "mining_seconds": "Duration of one proof-of-work search",
+    "merkle_nodes_hashed_total": "Merkle tree nodes hashed (leaves and parents)",
+    "merkle_root_seconds": "Time to build one Merkle root",
+    "merkle_proof_tree_seconds": "Time to build the full Merkle tree used for inclusion proofs",
+    "blocks_validated_total": "Blocks checked by Blockchain.validate",
+    "validation_errors_total": "Problems reported by Blockchain.validate",
+    "validation_seconds": "Duration of one Blockchain.validate call",
+    "signatures_verified_total": "RSA signatures verified",
+    "signature_failures_total": "RSA signatures that did not verify",
+    "signature_verify_seconds": "Time to verify one RSA signature",
+    "signatures_created_total": "RSA signatures created",
+    "signature_sign_seconds": "Time to create one RSA signature",
+    "blocks_produced_total": "Blocks appended by Blockchain.add_block",
+    "block_production_seconds": "Time to build, check and mine one block",
+}
+
+
+# -------------------------
+# Metric types
+# -------------------------
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    __slots__ = ("name", "help", "buckets", "counts", "sum", "count")
+
+    def __init__(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot: above every bound (+Inf)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # Linear scan: a dozen buckets are faster to walk than to bisect
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        # (upper bound, observations <= bound) pairs, ending with +Inf, as Prometheus expects
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {_format_bound(bound): total for bound, total in self.cumulative()},
+        }
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+# -------------------------
+# Registry: every metric of the process, by name
+# -------------------------
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()  # Blocks are produced and signatures verified on worker threads
+
+    def _get(self, name, kind):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind(name, METRICS.get(name, ""))
+        return metric
+
+    def counter(self, name):
+        return self._get(name, Counter)
+
+    def histogram(self, name):
+        return self._get(name, Histogram)
+
+    def record(self, timer=None, seconds=0.0, **counts):
+        # Observe `seconds` in histogram `timer` (if given) and add each count to its counter
+        with self._lock:
+            if timer is not None:
+                self.histogram(timer).observe(seconds)
+            for name, amount in counts.items():
+                self.counter(name).inc(amount)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self):
+        # {name: counter value or histogram dict}, for JSON export and tests
+        with self._lock:
+            return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for name, metric in sorted(self._metrics.items()):
+                full_name = f"{NAMESPACE}_{name}"
+                if metric.help:
+                    lines.append(f"# HELP {full_name} {metric.help}")
+                if isinstance(metric, Counter):
+                    lines.append(f"# TYPE {full_name} counter")
+                    lines.append(f"{full_name} {metric.value}")
+                else:
+                    lines.append(f"# TYPE {full_name} histogram")
+                    for bound, total in metric.cumulative():
+                        lines.append(f'{full_name}_bucket{{le="{_format_bound(bound)}"}} {total}')
+                    lines.append(f"{full_name}_sum {metric.sum}")
+                    lines.append(f"{full_name}_count {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+
+REGISTRY = Registry()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def disable():
+    enable(False)
+
+
+def record(timer=None, seconds=0.0, **counts):
+    """
+    Record one operation in the default registry. Callers check ENABLED first, e.g.
+        if chain_metrics.ENABLED:
+            chain_metrics.record("merkle_root_seconds", elapsed, merkle_nodes_hashed_total=nodes)
+    """
+    REGISTRY.record(timer, seconds, **counts)
+
+
+def record_merkle_tree(timer, seconds, leaves, leaves_counted=True):
+    """
+    Record one Merkle tree build over `leaves` transactions: every leaf and parent node goes
+    into merkle_nodes_hashed_total. Leaves hashed through hashing_basics.hash_many are already
+    in hashes_total (leaves_counted=True); otherwise they are added here as well.
+    """
+    parents = 0
+    size = leaves
+    while size > 1:
+        size = (size + 1) // 2  # An odd node is paired with itself, so it still makes a parent
+        parents += size
+    record(timer, seconds, merkle_nodes_hashed_total=leaves + parents,
+           hashes_total=parents if leaves_counted else leaves + parents)
+
+
+class timer:
+    """
+    Context manager timing a block of code into histogram `name`, plus optional counters:
+        with chain_metrics.timer("validation_seconds", blocks_validated_total=n): ...
+    Does nothing (beyond the with statement) while metrics are disabled.
+    """
+    __slots__ = ("name", "counts", "started")
+
+    def __init__(self, name, **counts):
+        self.name = name
+        self.counts = counts
+        self.started = None
+
+    def __enter__(self):
+        if ENABLED:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.started is not None:
+            record(self.name, time.perf_counter() - self.started, **self.counts)
+        return False
+
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+
+def to_prometheus():
+    return REGISTRY.to_prometheus()
+
+
+def to_json():
+    return REGISTRY.to_json()
+
+
+def reset():
+    REGISTRY.reset()
+
+
+# -------------------------
+# BlockProfiler: cProfile sampling around block production
+# -------------------------
+PROFILER = None  # Set by enable_profiling; Blockchain.add_block runs through it when set
+
+
+class BlockProfiler:
+    def __init__(self, every=100):
+        """
+        Run one in every `every` calls under cProfile and merge the samples, so profiling a
+        long-running producer only slows down the sampled blocks.
+        """
+        self.every = every
+        self.calls = 0
+        self.profiled = 0
+        self.stats = None  # pstats.Stats with every sample merged
+        self._lock = threading.Lock()
+
+    def run(self, func, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            sample = self.calls % self.every == 1 % self.every
+        if not sample:
+            return func(*args, **kwargs)
+
+        import cProfile  # Imported here: only profiled runs need it
+        import pstats
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.profiled += 1
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+
+    def report(self, limit=20, sort="cumulative"):
+        # Text table of the most expensive functions over every sampled block
+        import io
+
+        if self.stats is None:
+            return "no blocks profiled yet\n"
+        out = io.StringIO()
+        with self._lock:
+            self.stats.stream = out
+            self.stats.sort_stats(sort).print_stats(limit)
+        return f"{self.profiled} of {self.calls} blocks profiled\n" + out.getvalue()
+
+    def dump(self, path):
+        # Save the merged samples for snakeviz / pstats
+        if self.stats is not None:
+            with self._lock:
+                self.stats.dump_stats(path)
+
+
+def enable_profiling(every=100):
+    # Profile one in every `every` produced blocks; returns the profiler to read reports from
+    global PROFILER
+    PROFILER = BlockProfiler(every)
+    return PROFILER
+
+
+def disable_profiling():
+    global PROFILER
+    PROFILER = None
+
+
+if __name__ == "__main__":
+    enable()
+    for n in range(1, 6):
+        with timer("merkle_root_seconds", merkle_nodes_hashed_total=2 * n - 1):
+            time.sleep(0.001 * n)
+    record(hashes_total=1000, nonces_tried_total=1000)
+    print(to_prometheus())
+    print(to_json())
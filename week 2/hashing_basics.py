@@ -1,26 +1,134 @@
 import hashlib
+import os
+
+import chain_metrics
+
+# Shared SHA-256 helpers: the Merkle, block and proof-of-work code all hash through this module.
+
+# hashlib releases the GIL only for inputs longer than 2047 bytes, so threads only help
+# batches of large items; everything smaller is hashed in a plain loop
+MIN_PARALLEL_ITEM_SIZE = 2048
+MIN_PARALLEL_BYTES = 1024 * 1024  # Below this much data in total a batch is not worth the threads
+
+# Bytes read and hashed per step by hash_stream / hash_file
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_executors = {}  # workers -> shared ThreadPoolExecutor, created on the first parallel batch
+
+CPU_COUNT = os.cpu_count() or 1  # Looked up once: hash_many runs for every Merkle tree
+
+
+def _as_bytes(data):
+    # str (or anything else with encode(), e.g. a Transaction) -> bytes; bytes-like input is used as is
+    if type(data) is str:
+        return data.encode()
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    return data.encode()
+
 
 # Function to generate SHA-256 hash
-def generate_hash(data):
-    # Encode the data to bytes because hashlib works on bytes
-    return hashlib.sha256(data.encode()).hexdigest()
-
-# Example data
-data1 = "Blockchain"
-data2 = "blockchain"  # Notice: Only 'B' vs 'b'
-
-# Generate hashes
-hash1 = generate_hash(data1)
-hash2 = generate_hash(data2)
-
-# Print results
-print(f"Data 1: {data1}")
-print(f"Hash 1: {hash1}\n")
-print(f"Data 2: {data2}")
-print(f"Hash 2: {hash2}\n")
-
-# Check if hashes are same or different
-if hash1 == hash2:
-    print("Both hashes are same → No Avalanche Effect")
-else:
-    print("Hashes are different → Avalanche Effect Observed!")
\ No newline at end of file
+def generate_hash(data, raw=False):
+    """
+    data: str or bytes-like. Returns the hex digest, or the raw 32-byte digest with raw=True
+    (cheaper when the result is only compared or hashed again).
+    """
+    digest = hashlib.sha256(data if type(data) is bytes else _as_bytes(data))
+    return digest.digest() if raw else digest.hexdigest()
+
+
+def new_hasher(data=b""):
+    # SHA-256 object that has already absorbed `data`; .copy() it to hash many suffixes cheaply
+    return hashlib.sha256(_as_bytes(data))
+
+
+def _worth_threads(items):
+    # Only batches of large items (hashlib releases the GIL above 2047 bytes) and enough data in total.
+    # The first item is checked before summing every length, so small items cost one len() call
+    if len(items) < 2 or len(_as_bytes(items[0])) < MIN_PARALLEL_ITEM_SIZE:
+        return False
+    sizes = [len(_as_bytes(item)) for item in items]
+    total = sum(sizes)
+    return total >= MIN_PARALLEL_BYTES and total >= MIN_PARALLEL_ITEM_SIZE * len(items)
+
+
+def hash_many(items, raw=False, workers=None):
+    """
+    Hash every item of a list or iterator (str or bytes-like) and return the digests in order.
+    Batches of large items are spread over a thread pool (workers=None: one thread per core);
+    workers=1 always hashes in the calling thread.
+    """
+    if not isinstance(items, list):
+        items = list(items)
+    if chain_metrics.ENABLED:
+        chain_metrics.record(hashes_total=len(items))
+    if (workers or CPU_COUNT) > 1 and _worth_threads(items):
+        executor = _executors.get(workers)
+        if executor is None:
+            from concurrent.futures import ThreadPoolExecutor  # Only needed for large batches
+
+            executor = _executors[workers] = ThreadPoolExecutor(max_workers=workers)
+        return list(executor.map(lambda item: generate_hash(item, raw), items))
+
+    sha256 = hashlib.sha256  # Bound once for the loop
+    if raw:
+        return [sha256(item.encode() if type(item) is str else _as_bytes(item)).digest() for item in items]
+    return [sha256(item.encode() if type(item) is str else _as_bytes(item)).hexdigest() for item in items]
+
+
+def hash_stream(source, chunk_size=DEFAULT_CHUNK_SIZE, raw=False):
+    """
+    Hash a large buffer (bytes, bytearray, mmap, ...) or a binary file object chunk by chunk.
+    Buffers are sliced through a memoryview and files are read into one reused buffer,
+    so no chunk is ever copied.
+    """
+    if chain_metrics.ENABLED:
+        chain_metrics.record(hashes_total=1)
+    digest = hashlib.sha256()
+    if hasattr(source, "readinto"):
+        buffer = bytearray(chunk_size)
+        with memoryview(buffer) as view:
+            while True:
+                count = source.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+    else:
+        # cast("B") counts bytes even for buffers of wider items
+        data = source.encode() if isinstance(source, str) else source
+        with memoryview(data) as buffer, buffer.cast("B") as view:
+            for start in range(0, len(view), chunk_size):
+                digest.update(view[start:start + chunk_size])
+    return digest.digest() if raw else digest.hexdigest()
+
+
+def hash_file(path, chunk_size=DEFAULT_CHUNK_SIZE, raw=False):
+    # Hash a file of any size using chunk_size bytes of memory
+    with open(path, "rb", buffering=0) as f:
+        return hash_stream(f, chunk_size, raw)
+
+if __name__ == "__main__":
+    # Example data
+    data1 = "Blockchain"
+    data2 = "blockchain"  # Notice: Only 'B' vs 'b'
+
+    # Generate hashes
+    hash1 = generate_hash(data1)
+    hash2 = generate_hash(data2)
+
+    # Print results
+    print(f"Data 1: {data1}")
+    print(f"Hash 1: {hash1}\n")
+    print(f"Data 2: {data2}")
+    print(f"Hash 2: {hash2}\n")
+
+    # Check if hashes are same or different
+    if hash1 == hash2:
+        print("Both hashes are same → No Avalanche Effect")
+    else:
+        print("Hashes are different → Avalanche Effect Observed!")
+
+    # Batch and streaming APIs give the same digests as hashing one input at a time
+    blobs = [bytes([i]) * 100_000 for i in range(32)]
+    print("\nBatch matches one-by-one?", hash_many(blobs) == [generate_hash(blob) for blob in blobs])
+    print("Streamed matches whole buffer?", hash_stream(b"".join(blobs), chunk_size=4096) == generate_hash(b"".join(blobs)))
@@ -0,0 +1,184 @@
+# Hybrid encryption: RSA-OAEP protects a one-time AES-GCM key, AES-GCM protects the payload.
+# Plain RSA-OAEP (rsa_encryption.py) can only encrypt ~190 bytes with a 2048-bit key and costs one
+# RSA operation per message; here RSA runs once per message whatever its size, and the body is
+# encrypted chunk by chunk so memory use stays bounded for payloads of any length.
+import io
+import os
+import struct
+
+
+def _oaep_padding():
+    # Same OAEP settings as rsa_encryption.py; one shared instance, created on first use
+    # so that importing this module does not load the cryptography backend
+    padding_obj = globals().get("OAEP_PADDING")
+    if padding_obj is None:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        padding_obj = globals()["OAEP_PADDING"] = padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask Generation Function
+            algorithm=hashes.SHA256(),                    # Hash Algorithm
+            label=None                                    # Optional label
+        )
+    return padding_obj
+
+
+def __getattr__(name):
+    # `hybrid_encryption.OAEP_PADDING` works and builds the padding on demand
+    if name == "OAEP_PADDING":
+        return _oaep_padding()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+MAGIC = b"MBHE1"  # Identifies the envelope format (and its version)
+DEFAULT_CHUNK_SIZE = 64 * 1024  # Plaintext bytes encrypted per AES-GCM chunk
+NONCE_PREFIX_SIZE = 8  # Random per message; a 4-byte chunk counter completes the 12-byte nonce
+
+# Envelope layout:
+#   MAGIC | wrapped key length (2 bytes) | RSA-OAEP wrapped AES key | nonce prefix (8 bytes)
+#   then for every chunk: ciphertext length (4 bytes) | AES-GCM ciphertext + tag
+# Each chunk's nonce and associated data include its number and a "last chunk" flag, so chunks
+# cannot be reordered, dropped or cut off at the end without decryption failing.
+CHUNK_HEADER = struct.Struct(">I")
+
+
+def _chunk_nonce_and_aad(prefix, number, last):
+    nonce = prefix + struct.pack(">I", number)
+    aad = struct.pack(">I?", number, last)
+    return nonce, aad
+
+
+def _read_exact(reader, size):
+    data = reader.read(size)
+    if len(data) != size:
+        raise ValueError("truncated envelope")
+    return data
+
+
+def encrypt_stream(public_key, reader, writer, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read plaintext from the binary file-like `reader` and write the encrypted envelope
+    to `writer`. Only about two chunks are held in memory at a time.
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    key = AESGCM.generate_key(bit_length=256)  # Fresh key for every message
+    aesgcm = AESGCM(key)
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    wrapped_key = public_key.encrypt(key, _oaep_padding())  # The only RSA operation
+
+    writer.write(MAGIC + struct.pack(">H", len(wrapped_key)) + wrapped_key + prefix)
+
+    number = 0
+    chunk = reader.read(chunk_size)
+    while True:
+        # Read one chunk ahead to know whether the current chunk is the last one
+        next_chunk = reader.read(chunk_size)
+        last = not next_chunk
+        nonce, aad = _chunk_nonce_and_aad(prefix, number, last)
+        ciphertext = aesgcm.encrypt(nonce, chunk, aad)
+        writer.write(CHUNK_HEADER.pack(len(ciphertext)) + ciphertext)
+        if last:
+            return
+        chunk = next_chunk
+        number += 1
+
+
+def decrypt_stream(private_key, reader, writer):
+    """
+    Decrypt an envelope from `reader` into `writer`.
+    Raises ValueError if the envelope was modified, truncated or is not for this key.
+    """
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    if _read_exact(reader, len(MAGIC)) != MAGIC:
+        raise ValueError("not a hybrid encryption envelope")
+    (wrapped_size,) = struct.unpack(">H", _read_exact(reader, 2))
+    key = private_key.decrypt(_read_exact(reader, wrapped_size), _oaep_padding())
+    aesgcm = AESGCM(key)
+    prefix = _read_exact(reader, NONCE_PREFIX_SIZE)
+
+    number = 0
+    while True:
+        header = reader.read(CHUNK_HEADER.size)
+        if not header:
+            raise ValueError("envelope ended before its last chunk")
+        if len(header) != CHUNK_HEADER.size:
+            raise ValueError("truncated envelope")  # Cut inside a chunk header
+        (size,) = CHUNK_HEADER.unpack(header)
+        ciphertext = _read_exact(reader, size)
+
+        # Try as an ordinary chunk first, then as the last chunk
+        for last in (False, True):
+            nonce, aad = _chunk_nonce_and_aad(prefix, number, last)
+            try:
+                writer.write(aesgcm.decrypt(nonce, ciphertext, aad))
+                break
+            except InvalidTag:
+                continue
+        else:
+            raise ValueError(f"chunk {number} failed authentication")
+
+        if last:
+            if reader.read(1):
+                raise ValueError("unexpected data after the last chunk")
+            return
+        number += 1
+
+
+def encrypt_message(public_key, message, chunk_size=DEFAULT_CHUNK_SIZE):
+    # In-memory version of encrypt_stream for bytes payloads
+    output = io.BytesIO()
+    encrypt_stream(public_key, io.BytesIO(message), output, chunk_size)
+    return output.getvalue()
+
+
+def decrypt_message(private_key, envelope):
+    output = io.BytesIO()
+    decrypt_stream(private_key, io.BytesIO(envelope), output)
+    return output.getvalue()
+
+
+def benchmark(private_key, payload_size=1024 * 1024, rsa_block_size=190):
+    """
+    Encrypt + decrypt payload_size bytes with the hybrid envelope and with plain RSA-OAEP
+    (the payload cut into rsa_block_size pieces, the most OAEP/SHA-256 allows for 2048-bit keys).
+    Returns throughput in MB/s for both paths.
+    """
+    import time
+
+    public_key = private_key.public_key()
+    payload = os.urandom(payload_size)
+    oaep = _oaep_padding()
+
+    start = time.perf_counter()
+    assert decrypt_message(private_key, encrypt_message(public_key, payload)) == payload
+    hybrid_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, payload_size, rsa_block_size):
+        piece = payload[i:i + rsa_block_size]
+        assert private_key.decrypt(public_key.encrypt(piece, oaep), oaep) == piece
+    rsa_seconds = time.perf_counter() - start
+
+    megabytes = payload_size / (1024 * 1024)
+    return {"hybrid_mb_per_s": megabytes / hybrid_seconds, "rsa_mb_per_s": megabytes / rsa_seconds}
+
+
+if __name__ == "__main__":
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+
+    # A payload far beyond what RSA-OAEP alone can encrypt
+    message = b"Blockchain Transaction: Alice pays Bob 10 BTC. " * 10_000
+    envelope = encrypt_message(public_key, message)
+    print("Original size: ", len(message), "bytes")
+    print("Envelope size: ", len(envelope), "bytes")
+    print("Decrypted OK?  ", decrypt_message(private_key, envelope) == message)
+
+    results = benchmark(private_key, payload_size=256 * 1024)
+    print(f"Hybrid AES-GCM: {results['hybrid_mb_per_s']:.1f} MB/s")
+    print(f"Plain RSA-OAEP: {results['rsa_mb_per_s']:.3f} MB/s")
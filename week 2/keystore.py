@@ -0,0 +1,157 @@
+# Pool of pre-generated RSA key pairs for simulated wallets
+import os
+import threading
+from collections import deque
+
+
+def _generate_private_key_der(key_size):
+    """
+    Generate one RSA private key and return it as unencrypted PKCS8 DER bytes.
+    Runs in a worker process; bytes (unlike key objects) can be sent back to the parent.
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.DER,                  # Compact binary encoding
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()     # Simulation keys only: not password protected
+    )
+
+
+# -------------------------
+# StoredKeyPair: one key from the store, parsed only when it is used
+# -------------------------
+class StoredKeyPair:
+    __slots__ = ("path", "_private_key")
+
+    def __init__(self, path):
+        self.path = path
+        self._private_key = None
+
+    @property
+    def private_key(self):
+        if self._private_key is None:
+            from cryptography.hazmat.primitives import serialization
+
+            with open(self.path, "rb") as f:
+                self._private_key = serialization.load_der_private_key(f.read(), password=None)
+        return self._private_key
+
+    @property
+    def public_key(self):
+        return self.private_key.public_key()
+
+    def public_pem(self):
+        # The public key in PEM format, as used by transactions and the signature verifier
+        from cryptography.hazmat.primitives import serialization
+
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+
+
+# -------------------------
+# KeyStore: directory of pre-generated keys, refilled in the background
+# -------------------------
+class KeyStore:
+    def __init__(self, path, key_size=2048, workers=None):
+        """
+        Keys are stored as path/key-NNNNNNNN.der files and reused on later runs, so the
+        expensive generation is paid once. Within one KeyStore every key is handed out once.
+        workers: processes used to generate new keys (None = one per CPU core).
+        """
+        self.path = path
+        self.key_size = key_size
+        self.workers = workers
+        os.makedirs(path, exist_ok=True)
+
+        key_files = sorted(name for name in os.listdir(path) if name.startswith("key-") and name.endswith(".der"))
+        self._available = deque(os.path.join(path, name) for name in key_files)
+        # Continue after the highest existing number: files may have been removed, leaving gaps
+        numbers = [int(name[4:-4]) for name in key_files if name[4:-4].isdigit()]
+        self._next_number = max(numbers) + 1 if numbers else 0
+        self._pending = 0  # Keys being generated right now
+        self._ready = threading.Condition()  # Guards the fields above; signalled when a key is written
+        self._executor = None
+
+    def __len__(self):
+        # Keys ready to be handed out
+        return len(self._available)
+
+    def fill(self, count, wait=True):
+        """
+        Generate `count` more keys in a process pool and save them in the store.
+        With wait=False this returns at once and keys become available as they finish.
+        With wait=True it returns once every key in progress (including earlier background
+        fills) has been saved.
+        """
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor  # Only needed once keys are generated
+
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures = []
+        with self._ready:
+            self._pending += count
+        for _ in range(count):
+            future = self._executor.submit(_generate_private_key_der, self.key_size)
+            future.add_done_callback(self._save_key)
+            futures.append(future)
+        if wait:
+            for future in futures:
+                future.result()
+            # result() can return before the done-callback has saved the key: wait for the saves
+            with self._ready:
+                self._ready.wait_for(lambda: self._pending == 0)
+
+    def _save_key(self, future):
+        with self._ready:
+            self._pending -= 1
+            if future.exception() is None:
+                path = os.path.join(self.path, f"key-{self._next_number:08d}.der")
+                self._next_number += 1
+                # Write to a temporary name first so a crash never leaves a half-written key file
+                with open(path + ".tmp", "wb") as f:
+                    f.write(future.result())
+                os.replace(path + ".tmp", path)
+                self._available.append(path)
+            self._ready.notify_all()
+
+    def take(self):
+        """
+        Hand out the next unused key pair in O(1). The key file is read only when the
+        key is first used. Waits for background generation if the store is empty and
+        generates a key directly if nothing is in progress.
+        """
+        with self._ready:
+            while not self._available and self._pending:
+                self._ready.wait()
+            if self._available:
+                return StoredKeyPair(self._available.popleft())
+        self.fill(1)
+        return self.take()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    store = KeyStore(os.path.join(tempfile.gettempdir(), "mini_blockchain_keys"))
+    if len(store) < 20:
+        start = time.time()
+        store.fill(20 - len(store))
+        print(f"Generated keys in {time.time() - start:.2f}s")
+
+    # Creating wallets only takes file handles; keys are parsed when first used
+    start = time.time()
+    wallets = [store.take() for _ in range(20)]
+    print(f"Handed out {len(wallets)} wallets in {(time.time() - start) * 1000:.2f} ms")
+    print("First wallet public key:\n", wallets[0].public_pem().decode())
+    store.close()
@@ -0,0 +1,138 @@
+import struct
+
+# Compact storage for block header fields: every field listed in a class's PACKED_FIELDS lives
+# in one immutable bytes object instead of a Python object of its own. A 64-character hex hash
+# takes 32 bytes there instead of a ~113-byte str, and an int or float 8 bytes instead of 24-32,
+# which is what keeps a chain of millions of blocks small.
+#
+#   class Block(PackedFields):
+#       PACKED_FIELDS = (("index", INT), ("timestamp", FLOAT), ("hash", DIGEST))
+#       __slots__ = ("data",)
+#
+# Reading a field returns the same value (and type) that was assigned; hash fields come back as
+# hex strings. A value that does not fit its packed format (e.g. the genesis previous_hash "0",
+# a tampered non-hex hash or a non-int index) is kept as is in a small side dict instead.
+
+INT = "q"  # Signed 64-bit integer; only exact ints are packed, so bools and floats keep their type
+FLOAT = "d"  # Double; only exact floats are packed, so repr() and therefore hashes are unchanged
+DIGEST = "32s"  # SHA-256 hash: given as a lowercase 64-character hex string (or the raw 32 bytes)
+
+_PLACEHOLDERS = {INT: 0, FLOAT: 0.0, DIGEST: b""}  # Packed in place of a value kept unpacked
+
+
+def _pack_int(value):
+    return value if type(value) is int and -2**63 <= value < 2**63 else None
+
+
+def _pack_float(value):
+    return value if type(value) is float else None
+
+
+def _pack_digest(value):
+    if type(value) is bytes:
+        return value if len(value) == 32 else None
+    if type(value) is str and len(value) == 64 and value == value.lower():  # Upper case would not read back the same
+        try:
+            digest = bytes.fromhex(value)
+        except ValueError:
+            return None
+        if len(digest) == 32:  # fromhex skips spaces, which would leave the digest short
+            return digest
+    return None
+
+
+_ENCODERS = {INT: _pack_int, FLOAT: _pack_float, DIGEST: _pack_digest}
+
+
+def _packed_property(position, name, fmt, offset):
+    unpack_from = struct.Struct("<" + fmt).unpack_from
+    digest = fmt == DIGEST
+
+    def get(self):
+        unpacked = self._unpacked
+        if unpacked is not None and name in unpacked:
+            return unpacked[name]
+        value = unpack_from(self._packed, offset)[0]
+        return value.hex() if digest else value
+
+    def set(self, value):
+        values = list(self._layout.unpack(self._packed))
+        unpacked = dict(self._unpacked or {})
+        unpacked.pop(name, None)
+        encoded = _ENCODERS[fmt](value)
+        if encoded is None:
+            unpacked[name] = value
+            encoded = _PLACEHOLDERS[fmt]
+        values[position] = encoded
+        self._packed = self._layout.pack(*values)
+        self._unpacked = unpacked or None
+
+    return property(get, set)
+
+
+class PackedFields:
+    """
+    Base class for slot-based objects whose PACKED_FIELDS ((name, format) pairs, formats INT,
+    FLOAT or DIGEST) are stored packed. Subclasses set every packed field at once with
+    _pack(...) in __init__; assigning a single field afterwards re-packs the record, so
+    tampering with a field is seen by anything that reads it again.
+    """
+    __slots__ = ("_packed", "_unpacked")
+    PACKED_FIELDS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "PACKED_FIELDS" not in cls.__dict__:
+            return
+        cls._layout = struct.Struct("<" + "".join(fmt for _, fmt in cls.PACKED_FIELDS))
+        cls._encoders = tuple(_ENCODERS[fmt] for _, fmt in cls.PACKED_FIELDS)
+        # For _pack's fast path: positions of the hash fields and the exact type of every field once packed
+        cls._digest_positions = tuple(i for i, (_, fmt) in enumerate(cls.PACKED_FIELDS) if fmt == DIGEST)
+        cls._number_types = tuple((i, int if fmt == INT else float)
+                                  for i, (_, fmt) in enumerate(cls.PACKED_FIELDS) if fmt != DIGEST)
+        offset = 0
+        for position, (name, fmt) in enumerate(cls.PACKED_FIELDS):
+            setattr(cls, name, _packed_property(position, name, fmt, offset))
+            offset += struct.calcsize("<" + fmt)
+
+    def _values(self):
+        # Every packed field at once, in PACKED_FIELDS order (one unpack instead of one per field)
+        values = [value.hex() if type(value) is bytes else value for value in self._layout.unpack(self._packed)]
+        if self._unpacked is not None:
+            for position, (name, _) in enumerate(self.PACKED_FIELDS):
+                if name in self._unpacked:
+                    values[position] = self._unpacked[name]
+        return values
+
+    def _pack(self, *values):
+        # Set every packed field, in PACKED_FIELDS order. Blocks are built millions of times, so the
+        # usual case (exact ints and floats, lowercase hex or raw hashes) is packed with few checks
+        encoded = list(values)
+        try:
+            for position in self._digest_positions:
+                value = encoded[position]
+                if type(value) is str:
+                    digest = bytes.fromhex(value)
+                    if len(value) != 64 or digest.hex() != value:  # Upper case or spaces would not read back
+                        raise ValueError
+                    encoded[position] = digest
+                elif len(value) != 32:
+                    raise ValueError
+            for position, kind in self._number_types:
+                if type(encoded[position]) is not kind:
+                    raise TypeError
+            self._packed = self._layout.pack(*encoded)
+            self._unpacked = None
+            return
+        except (TypeError, ValueError, struct.error):  # Not hex, not bytes, or an int beyond 64 bits
+            pass
+
+        # Some value does not fit its format: keep it in the side dict
+        encoded = [encode(value) for encode, value in zip(self._encoders, values)]
+        unpacked = {}
+        for position, (name, fmt) in enumerate(self.PACKED_FIELDS):
+            if encoded[position] is None:
+                unpacked[name] = values[position]
+                encoded[position] = _PLACEHOLDERS[fmt]
+        self._packed = self._layout.pack(*encoded)
+        self._unpacked = unpacked
@@ -1,67 +1,100 @@
-# Import necessary cryptographic modules
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import hashes, serialization
+# RSA digital signatures step by step.
+# The cryptography backend is imported inside each function, so importing this module is instant
+# and the cost is only paid when a key is actually generated or used.
+import time
+
+import chain_metrics  # Signing and verification are counted and timed when metrics are enabled
 
 # STEP 1: Generate RSA Private Key
 # Why: This private key will be used to both sign messages (for authentication) and derive the public key.
-private_key = rsa.generate_private_key(
-    public_exponent=65537,  # Standard value for RSA; a good balance of performance and security
-    key_size=2048           # 2048-bit key size is widely used and considered secure for most applications
-)
+def generate_private_key():
+    from cryptography.hazmat.primitives.asymmetric import rsa
 
-# STEP 2: Derive the Public Key from the Private Key
-# Why: The public key is used by others to verify the signature created by the private key.
-public_key = private_key.public_key()
+    return rsa.generate_private_key(
+        public_exponent=65537,  # Standard value for RSA; a good balance of performance and security
+        key_size=2048           # 2048-bit key size is widely used and considered secure for most applications
+    )
 
 # STEP 3: (Optional) Serialize the Keys to PEM format
 # Why: PEM format is a widely-used text encoding for storing keys.
 # This step is useful if you want to save or export the keys.
+def serialize_keys(private_key):
+    from cryptography.hazmat.primitives import serialization
 
-# Serialize (convert to bytes) the private key in PEM format
-pem_private = private_key.private_bytes(
-    encoding=serialization.Encoding.PEM,                        # Encode as PEM
-    format=serialization.PrivateFormat.TraditionalOpenSSL,     # Standard private key format
-    encryption_algorithm=serialization.NoEncryption()          # No encryption (for demo purposes; use password in real use)
-)
-
-# Serialize the public key in PEM format
-pem_public = public_key.public_bytes(
-    encoding=serialization.Encoding.PEM,                        # Encode as PEM
-    format=serialization.PublicFormat.SubjectPublicKeyInfo      # Standard public key format
-)
+    # Serialize (convert to bytes) the private key in PEM format
+    pem_private = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,                        # Encode as PEM
+        format=serialization.PrivateFormat.TraditionalOpenSSL,     # Standard private key format
+        encryption_algorithm=serialization.NoEncryption()          # No encryption (for demo purposes; use password in real use)
+    )
 
-# Print the serialized keys for viewing or saving
-print("Private Key:\n", pem_private.decode())  # Decode bytes to string for printing
-print("Public Key:\n", pem_public.decode())
+    # Serialize the public key in PEM format
+    pem_public = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,                        # Encode as PEM
+        format=serialization.PublicFormat.SubjectPublicKeyInfo      # Standard public key format
+    )
+    return pem_private, pem_public
 
 # STEP 4: Sign a Message with the Private Key
 # Why: This generates a digital signature that proves the message was created by someone holding the private key.
-message = b"Send 10 BTC to Bob"  # The message we want to sign
+def sign_message(private_key, message):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
 
-# Create the digital signature using RSA-PSS padding and SHA-256 hashing
-signature = private_key.sign(
-    message,
-    padding.PSS(
-        mgf=padding.MGF1(hashes.SHA256()),      # Mask Generation Function using SHA-256
-        salt_length=padding.PSS.MAX_LENGTH      # Use maximum salt length (recommended for security)
-    ),
-    hashes.SHA256()                              # Hashing algorithm used in signature
-)
+    # Create the digital signature using RSA-PSS padding and SHA-256 hashing
+    with chain_metrics.timer("signature_sign_seconds", signatures_created_total=1):
+        return private_key.sign(
+            message,
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),      # Mask Generation Function using SHA-256
+                salt_length=padding.PSS.MAX_LENGTH      # Use maximum salt length (recommended for security)
+            ),
+            hashes.SHA256()                              # Hashing algorithm used in signature
+        )
 
 # STEP 5: Verify the Signature using the Public Key
 # Why: This checks if the message was really signed by the holder of the private key and not modified.
+def verify_signature(public_key, message, signature):
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
 
-try:
-    # Attempt to verify the signature
-    public_key.verify(
-        signature,                               # The signature to verify
-        message,                                 # The original message
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),   # Must match the padding used in signing
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()                          # Must match the hashing algorithm used in signing
-    )
-    print("Signature Verified. Data not tampered.")  # Verification successful
-except:
-    print(" Verification Failed. Data changed!")       # Verification failed — data was altered or signature invalid
+    started = time.perf_counter()
+    try:
+        # Attempt to verify the signature
+        public_key.verify(
+            signature,                               # The signature to verify
+            message,                                 # The original message
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),   # Must match the padding used in signing
+                salt_length=padding.PSS.MAX_LENGTH
+            ),
+            hashes.SHA256()                          # Must match the hashing algorithm used in signing
+        )
+        ok = True
+    except InvalidSignature:
+        ok = False
+    if chain_metrics.ENABLED:
+        chain_metrics.record("signature_verify_seconds", time.perf_counter() - started,
+                             signatures_verified_total=1, signature_failures_total=0 if ok else 1)
+    return ok
+
+if __name__ == "__main__":
+    private_key = generate_private_key()
+
+    # STEP 2: Derive the Public Key from the Private Key
+    # Why: The public key is used by others to verify the signature created by the private key.
+    public_key = private_key.public_key()
+
+    # Print the serialized keys for viewing or saving
+    pem_private, pem_public = serialize_keys(private_key)
+    print("Private Key:\n", pem_private.decode())  # Decode bytes to string for printing
+    print("Public Key:\n", pem_public.decode())
+
+    message = b"Send 10 BTC to Bob"  # The message we want to sign
+    signature = sign_message(private_key, message)
+
+    if verify_signature(public_key, message, signature):
+        print("Signature Verified. Data not tampered.")  # Verification successful
+    else:
+        print(" Verification Failed. Data changed!")       # Verification failed — data was altered or signature invalid
@@ -1,30 +1,46 @@
--
-public_key = private_key.public_key()
+# RSA-OAEP encryption step by step.
+# For payloads larger than ~190 bytes see hybrid_encryption.py.
+# The cryptography backend is imported inside the functions, so importing this module is instant.
 
-# Step 2: Define the Message to Encrypt
-message = b"Hello Blockchain RSA!"
+# Same padding settings for encrypting and decrypting
+def _oaep_padding():
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
 
-# Step 3: Encrypt the Message using the Public Key
-ciphertext = public_key.encrypt(
-    message,
-    padding.OAEP(
+    return padding.OAEP(
         mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask Generation Function
         algorithm=hashes.SHA256(),                    # Hash Algorithm
         label=None                                    # Optional label
     )
-)
 
-# Step 4: Decrypt the Ciphertext using the Private Key
-decrypted_message = private_key.decrypt(
-    ciphertext,
-    padding.OAEP(
-        mgf=padding.MGF1(algorithm=hashes.SHA256()),
-        algorithm=hashes.SHA256(),
-        label=None
+# Step 1: Generate the RSA Key Pair
+def generate_private_key():
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    return rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048
     )
-)
 
-# Step 5: Display the Results
-print("Original Message: ", message.decode())
-print("Encrypted Message:", ciphertext)  # Ciphertext will appear as unreadable bytes
-print("Decrypted Message:", decrypted_message.decode())
+# Step 3: Encrypt the Message using the Public Key
+def encrypt_message(public_key, message):
+    return public_key.encrypt(message, _oaep_padding())
+
+# Step 4: Decrypt the Ciphertext using the Private Key
+def decrypt_message(private_key, ciphertext):
+    return private_key.decrypt(ciphertext, _oaep_padding())
+
+if __name__ == "__main__":
+    private_key = generate_private_key()
+    public_key = private_key.public_key()
+
+    # Step 2: Define the Message to Encrypt
+    message = b"Hello Blockchain RSA!"
+
+    ciphertext = encrypt_message(public_key, message)
+    decrypted_message = decrypt_message(private_key, ciphertext)
+
+    # Step 5: Display the Results
+    print("Original Message: ", message.decode())
+    print("Encrypted Message:", ciphertext)  # Ciphertext will appear as unreadable bytes
+    print("Decrypted Message:", decrypted_message.decode())
@@ -0,0 +1,148 @@
+# Batch verification of RSA-PSS signatures (as produced in rsa_digital_sign.py)
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import chain_metrics
+
+# Below this many signatures the thread pool costs more than it saves
+MIN_PARALLEL_BATCH = 8
+
+
+def _signature_params():
+    """
+    Return the shared (PSS_PADDING, SIGNATURE_HASH) pair, creating it on first use.
+    Padding and hash objects are immutable, so one instance is shared by every verification
+    instead of building new PSS/MGF1/SHA256 objects for each signature. Building them lazily
+    keeps the cryptography backend out of the import of this module.
+    """
+    params = globals().get("PSS_PADDING"), globals().get("SIGNATURE_HASH")
+    if params[0] is None:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        params = (
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),      # Must match the padding used in signing
+                salt_length=padding.PSS.MAX_LENGTH
+            ),
+            hashes.SHA256(),
+        )
+        globals()["PSS_PADDING"], globals()["SIGNATURE_HASH"] = params
+    return params
+
+
+def __getattr__(name):
+    # `from signature_verifier import PSS_PADDING` works and builds the objects on demand
+    if name in ("PSS_PADDING", "SIGNATURE_HASH"):
+        return dict(zip(("PSS_PADDING", "SIGNATURE_HASH"), _signature_params()))[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class SignatureVerifier:
+    def __init__(self, workers=None, max_cached_keys=1024):
+        """
+        Verify (public key, message, signature) items, one result per item.
+        workers: threads used by verify_batch (None lets the executor pick); the cryptography
+                 backend releases the GIL during RSA operations, so threads run in parallel.
+        max_cached_keys: number of parsed public keys kept, least recently used dropped first.
+        """
+        self.max_cached_keys = max_cached_keys
+        self._keys = OrderedDict()  # fingerprint -> loaded public key object
+        self._lock = threading.Lock()  # The key cache is shared by all worker threads
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def load_public_key(self, public_key):
+        """
+        Return a public key object for a PEM or DER encoded key.
+        Keys are cached by the SHA-256 fingerprint of their encoding, so each sender's key is
+        parsed only once. Key objects are returned unchanged.
+        """
+        if not isinstance(public_key, bytes):
+            return public_key
+
+        fingerprint = hashlib.sha256(public_key).digest()
+        with self._lock:
+            key = self._keys.get(fingerprint)
+            if key is not None:
+                self._keys.move_to_end(fingerprint)  # Mark as recently used
+                return key
+
+        # Parse outside the lock so other threads are not blocked meanwhile
+        from cryptography.hazmat.primitives import serialization
+
+        if public_key.startswith(b"-----BEGIN"):
+            key = serialization.load_pem_public_key(public_key)
+        else:
+            key = serialization.load_der_public_key(public_key)
+
+        with self._lock:
+            self._keys[fingerprint] = key
+            if len(self._keys) > self.max_cached_keys:
+                self._keys.popitem(last=False)  # Drop the least recently used key
+        return key
+
+    def verify(self, public_key, message, signature):
+        # True if signature is a valid RSA-PSS/SHA-256 signature of message; never raises
+        from cryptography.exceptions import InvalidSignature
+
+        pss_padding, signature_hash = _signature_params()
+        started = time.perf_counter()
+        try:
+            key = self.load_public_key(public_key)
+            key.verify(signature, message, pss_padding, signature_hash)
+            ok = True
+        except (InvalidSignature, ValueError, TypeError):
+            # Bad signature, or a key that cannot be parsed / is not an RSA key
+            ok = False
+        if chain_metrics.ENABLED:
+            chain_metrics.record("signature_verify_seconds", time.perf_counter() - started,
+                                 signatures_verified_total=1, signature_failures_total=0 if ok else 1)
+        return ok
+
+    def _verify_item(self, item):
+        return self.verify(*item)
+
+    def verify_batch(self, items):
+        """
+        Verify an iterable of (public_key, message, signature) tuples.
+        Returns a list of booleans in the same order as the items.
+        """
+        items = list(items)
+        if len(items) < MIN_PARALLEL_BATCH:
+            return [self._verify_item(item) for item in items]
+        return list(self._executor.map(self._verify_item, items))
+
+    def close(self):
+        self._executor.shutdown()
+
+
+if __name__ == "__main__":
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    PSS_PADDING, SIGNATURE_HASH = _signature_params()
+
+    # A few senders, each signing several transactions
+    senders = [rsa.generate_private_key(public_exponent=65537, key_size=2048) for _ in range(3)]
+    items = []
+    for n in range(30):
+        private_key = senders[n % len(senders)]
+        pem_public = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        message = f"Tx{n}: Alice pays Bob {n} BTC".encode()
+        items.append((pem_public, message, private_key.sign(message, PSS_PADDING, SIGNATURE_HASH)))
+
+    # Tamper with one message: only that item should fail
+    pem_public, _, signature = items[7]
+    items[7] = (pem_public, b"Tx7: Alice pays Bob 700 BTC", signature)
+
+    verifier = SignatureVerifier()
+    results = verifier.verify_batch(items)
+    verifier.close()
+    print("Valid signatures:", sum(results), "of", len(results))
+    print("Failed items:", [i for i, ok in enumerate(results) if not ok])
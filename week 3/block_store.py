@@ -0,0 +1,352 @@
+import mmap
+import os
+import struct
+
+# -------------------------
+# BlockStore: append-only, file-backed storage for serialized blocks
+# -------------------------
+# Layout of a store directory:
+#   blocks-00000.log, blocks-00001.log, ...  segment files holding block payloads back to back
+#   blocks.idx                               one fixed-size record per height:
+#                                            segment number, offset, length, raw 32-byte block hash
+#   blocks.hidx                              hash table from block hash to height (see HashIndex)
+# Because index records have a fixed size, the record for height h lives at h * RECORD_SIZE,
+# so lookup by height is O(1) and reopening a chain only memory-maps the index file.
+# Lookup by hash is O(1) as well, also right after reopening: the hash table is kept on disk.
+
+INDEX_RECORD = struct.Struct(">IQI32s")  # segment, offset, length, block hash
+RECORD_SIZE = INDEX_RECORD.size
+
+# Start a new segment file once the current one grows past this many bytes
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+HASH_INDEX_HEADER = struct.Struct(">QQQ")  # capacity (slots), heights covered, slots used (incl. deleted)
+HASH_SLOT = struct.Struct(">I")  # height + 1
+EMPTY_SLOT = 0
+DELETED_SLOT = 0xFFFFFFFF
+MIN_HASH_CAPACITY = 1024
+
+
+# -------------------------
+# HashIndex: on-disk hash table from block hash to height
+# -------------------------
+class HashIndex:
+    """
+    Open-addressing hash table in blocks.hidx, memory-mapped like the index.
+    Slots hold only heights: the hash is read back from the index record to confirm a match,
+    so a slot costs 4 bytes and a stale slot (e.g. after a crash) can never give a wrong answer.
+    The table is at most half full and doubles (rebuilt from blocks.idx) when it gets there.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.path = os.path.join(store.path, "blocks.hidx")
+        self._file = None
+        self._map = None
+        self.capacity = self.covered = self.used = 0
+        if os.path.exists(self.path):
+            self._open()
+        if store.read_only:
+            return
+
+        if self._map is None:
+            # New store, or one written before the hash index existed
+            self._rebuild(MIN_HASH_CAPACITY)
+        elif self.covered > len(store):
+            self._set_header(len(store))  # Blocks dropped by a truncate that did not finish
+        else:
+            for height in range(self.covered, len(store)):  # Appends whose slot was not written
+                self.add(height, store.raw_hash_at(height))
+
+    def _open(self):
+        self._file = open(self.path, "rb" if self.store.read_only else "r+b")
+        size = os.path.getsize(self.path)
+        if size >= HASH_INDEX_HEADER.size:
+            capacity, covered, used = HASH_INDEX_HEADER.unpack(self._file.read(HASH_INDEX_HEADER.size))
+            if capacity and size == HASH_INDEX_HEADER.size + capacity * HASH_SLOT.size:
+                access = mmap.ACCESS_READ if self.store.read_only else mmap.ACCESS_WRITE
+                self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+                self.capacity, self.covered, self.used = capacity, covered, used
+                return
+        # Damaged or half-written table: ignored, and rebuilt unless read-only
+        self._file.close()
+        self._file = None
+
+    def _set_header(self, covered):
+        self.covered = covered
+        HASH_INDEX_HEADER.pack_into(self._map, 0, self.capacity, covered, self.used)
+
+    def _slot(self, digest):
+        return int.from_bytes(digest[:8], "big") & (self.capacity - 1)
+
+    def _rebuild(self, capacity):
+        # Write a fresh table of every stored block next to the old one, then swap it in
+        count = len(self.store)
+        while count * 2 > capacity:
+            capacity *= 2
+        self.capacity = capacity
+        mask = capacity - 1
+        slots = [EMPTY_SLOT] * capacity
+        for height, digest in enumerate(self.store.raw_hashes()):
+            i = int.from_bytes(digest[:8], "big") & mask
+            while slots[i] != EMPTY_SLOT:
+                i = (i + 1) & mask
+            slots[i] = height + 1
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(HASH_INDEX_HEADER.pack(capacity, count, count))
+            f.write(struct.pack(f">{capacity}I", *slots))
+        self.close()
+        os.replace(temporary, self.path)
+        self._open()
+
+    def add(self, height, digest):
+        # Insert the block at height (already in the index); keeps the table at most half full
+        if (self.used + 1) * 2 > self.capacity:
+            self._rebuild(self.capacity * 2)
+            return
+        table, mask = self._map, self.capacity - 1
+        i = int.from_bytes(digest[:8], "big") & mask
+        while True:
+            offset = HASH_INDEX_HEADER.size + i * HASH_SLOT.size
+            value = HASH_SLOT.unpack_from(table, offset)[0]
+            if value == EMPTY_SLOT or value == DELETED_SLOT:
+                break
+            i = (i + 1) & mask
+        HASH_SLOT.pack_into(table, offset, height + 1)
+        if value == EMPTY_SLOT:
+            self.used += 1
+        self.covered = max(self.covered, height + 1)
+        HASH_INDEX_HEADER.pack_into(table, 0, self.capacity, self.covered, self.used)
+
+    def remove(self, height):
+        # Mark the slot of the block at height deleted (lookups keep probing past it)
+        digest = self.store.raw_hash_at(height)
+        i = self._slot(digest)
+        while True:
+            offset = HASH_INDEX_HEADER.size + i * HASH_SLOT.size
+            value = HASH_SLOT.unpack_from(self._map, offset)[0]
+            if value == EMPTY_SLOT:
+                break
+            if value == height + 1:
+                HASH_SLOT.pack_into(self._map, offset, DELETED_SLOT)
+                break
+            i = (i + 1) & (self.capacity - 1)
+        self._set_header(min(self.covered, height))
+
+    def find(self, digest):
+        # Height of the block with this raw hash, or None
+        count = len(self.store)
+        i = self._slot(digest)
+        while True:
+            value = HASH_SLOT.unpack_from(self._map, HASH_INDEX_HEADER.size + i * HASH_SLOT.size)[0]
+            if value == EMPTY_SLOT:
+                return None
+            if value != DELETED_SLOT and value <= count and self.store.raw_hash_at(value - 1) == digest:
+                return value - 1
+            i = (i + 1) & (self.capacity - 1)
+
+    @property
+    def available(self):
+        return self._map is not None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BlockStore:
+    def __init__(self, path, segment_size=DEFAULT_SEGMENT_SIZE, read_only=False):
+        """
+        Open (or create) the store in directory `path`.
+        Payloads are opaque bytes; the caller decides how blocks are serialized.
+        read_only=True opens an existing store for reading only, e.g. from validation workers
+        while the owning process keeps it open for appending.
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.read_only = read_only
+        if not read_only:
+            os.makedirs(path, exist_ok=True)
+
+        self._index_path = os.path.join(path, "blocks.idx")
+        self._index_file = open(self._index_path, "rb" if read_only else "ab+")
+
+        # Drop a half-written index record left by a crash in the middle of an append
+        index_size = os.path.getsize(self._index_path)
+        if index_size % RECORD_SIZE and not read_only:
+            self._index_file.truncate(index_size - index_size % RECORD_SIZE)
+        self._count = os.path.getsize(self._index_path) // RECORD_SIZE
+
+        self._index_map = None  # Memory map of the index, re-created when blocks are appended
+        self._mapped_count = 0
+        self._readers = {}  # segment number -> open file for reading
+
+        # Continue writing into the last segment referenced by the index
+        self._segment = self._read_record(self._count - 1)[0] if self._count else 0
+        self._writer = None if read_only else open(self._segment_path(self._segment), "ab")
+
+        self._hash_index = HashIndex(self)
+        # Read-only store written before blocks.hidx existed: raw hash -> height, built on first use
+        self._hash_dict = None
+
+    def __len__(self):
+        return self._count
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f"blocks-{segment:05d}.log")
+
+    def _read_record(self, height):
+        if height >= self._mapped_count:
+            # Blocks were appended since the index was mapped: map the grown file
+            if self._index_map is not None:
+                self._index_map.close()
+            self._index_file.flush()
+            self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_count = self._count
+        return INDEX_RECORD.unpack_from(self._index_map, height * RECORD_SIZE)
+
+    def append(self, block_hash, payload):
+        """
+        Store the payload of the next block and return its height.
+        block_hash is the block's hex hash, kept in the index for lookups by hash.
+        """
+        if self.read_only:
+            raise PermissionError("block store was opened read-only")
+        if self._writer.tell() + len(payload) > self.segment_size and self._writer.tell() > 0:
+            # Current segment is full: start the next one
+            self._writer.close()
+            self._segment += 1
+            self._writer = open(self._segment_path(self._segment), "ab")
+
+        offset = self._writer.tell()
+        # Write the payload before its index record, so the index never points at missing data
+        self._writer.write(payload)
+        self._writer.flush()
+        digest = bytes.fromhex(block_hash)
+        self._index_file.write(INDEX_RECORD.pack(self._segment, offset, len(payload), digest))
+        self._index_file.flush()
+
+        height = self._count
+        self._count += 1
+        self._hash_index.add(height, digest)
+        return height
+
+    def get(self, height):
+        # Return the payload stored at height (negative heights count from the end)
+        if height < 0:
+            height += self._count
+        if not 0 <= height < self._count:
+            raise IndexError("block height out of range")
+
+        segment, offset, length, _ = self._read_record(height)
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = self._readers[segment] = open(self._segment_path(segment), "rb")
+        reader.seek(offset)
+        return reader.read(length)
+
+    def raw_hash_at(self, height):
+        return self._read_record(height)[3]
+
+    def raw_hashes(self):
+        # Raw hash of every stored block, in height order (one pass over the mapped index)
+        if not self._count:
+            return []
+        self._read_record(self._count - 1)  # Make sure the map covers every record
+        return (record[3] for record in INDEX_RECORD.iter_unpack(self._index_map[:self._count * RECORD_SIZE]))
+
+    def hash_at(self, height):
+        return self.raw_hash_at(height).hex()
+
+    def height_of(self, block_hash):
+        # Return the height of the block with this hex hash, or None if it is not stored
+        try:
+            digest = bytes.fromhex(block_hash)
+        except ValueError:
+            return None
+        if len(digest) != 32:
+            return None
+        if self._hash_index.available:
+            return self._hash_index.find(digest)
+        if self._hash_dict is None:
+            self._hash_dict = {digest: height for height, digest in enumerate(self.raw_hashes())}
+        return self._hash_dict.get(digest)
+
+    def truncate(self, length):
+        """
+        Drop every block from height `length` on, e.g. when a fork replaces the tip of the chain.
+        Later segment files are deleted and the segment holding block `length` is cut at its offset.
+        """
+        if self.read_only:
+            raise PermissionError("block store was opened read-only")
+        if not 0 <= length <= self._count:
+            raise IndexError("cannot truncate beyond the end of the store")
+        if length == self._count:
+            return
+        segment, offset = self._read_record(length)[:2]
+        for height in range(self._count - 1, length - 1, -1):
+            self._hash_index.remove(height)  # Needs the records, so before the index is cut
+
+        # Unmap and close everything that refers to the part being removed
+        self._index_map.close()
+        self._index_map = None
+        self._mapped_count = 0
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        self._writer.close()
+
+        self._index_file.truncate(length * RECORD_SIZE)
+        later = segment + 1
+        while os.path.exists(self._segment_path(later)):
+            os.remove(self._segment_path(later))
+            later += 1
+        with open(self._segment_path(segment), "r+b") as f:
+            f.truncate(offset)
+
+        self._segment = segment
+        self._writer = open(self._segment_path(segment), "ab")
+        self._count = length
+
+    def close(self):
+        self._hash_index.close()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        if self._writer is not None:
+            self._writer.close()
+        self._index_file.close()
+
+
+# -------------------------
+# StoredChain: read-only list-like view over a BlockStore
+# -------------------------
+class StoredChain:
+    def __init__(self, store, decode):
+        """
+        Blocks are decoded from the store only when accessed, so opening a long chain
+        is instant. decode turns a stored payload back into a Block object.
+        """
+        self.store = store
+        self.decode = decode
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, height):
+        if isinstance(height, slice):
+            return [self[i] for i in range(*height.indices(len(self)))]
+        return self.decode(self.store.get(height))
+
+    def __iter__(self):
+        for height in range(len(self)):
+            yield self[height]
@@ -1,25 +1,42 @@
-import hashlib
+import os
+import sys
 import time
 
-class Block:
+# Shared hashing helpers and the packed field storage live in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+from hashing_basics import generate_hash  # noqa: E402
+from packed_fields import DIGEST, FLOAT, INT, PackedFields  # noqa: E402
+
+class Block(PackedFields):
+    # index, timestamp and both hashes (as raw 32-byte digests) share one packed record;
+    # the hex strings are rebuilt when the attributes are read
+    PACKED_FIELDS = (("index", INT), ("timestamp", FLOAT), ("previous_hash", DIGEST), ("hash", DIGEST))
+    __slots__ = ("transactions",)
+
     def __init__(self, index, transactions, previous_hash):
-        self.index = index
-        self.timestamp = time.time()  # Current time
+        timestamp = time.time()  # Current time
         self.transactions = transactions
-        self.previous_hash = previous_hash
-        self.hash = self.calculate_hash()
+        digest = generate_hash(self._header(index, timestamp, transactions, previous_hash), raw=True)
+        self._pack(index, timestamp, previous_hash, digest)
 
-    def calculate_hash(self):
+    @staticmethod
+    def _header(index, timestamp, transactions, previous_hash):
         # Combine block data into one string using f-string
-        block_string = f"{self.index}{self.timestamp}{self.transactions}{self.previous_hash}"
-        # Return SHA-256 hash
-        return hashlib.sha256(block_string.encode()).hexdigest()
-
-# ---- Test Code ----
-block1 = Block(1, "Tx1: Alice -> Bob", "0")  # First block
-
-# Print block data using f-strings
-print(f"Block Index: {block1.index}")
-print(f"Transactions: {block1.transactions}")
-print(f"Previous Hash: {block1.previous_hash}")
-print(f"Current Hash: {block1.hash}")
+        return f"{index}{timestamp}{transactions}{previous_hash}".encode()
+
+    def header_bytes(self):
+        return self._header(self.index, self.timestamp, self.transactions, self.previous_hash)
+
+    def calculate_hash(self):
+        # Return SHA-256 hash of the header
+        return generate_hash(self.header_bytes())
+
+if __name__ == "__main__":
+    # ---- Test Code ----
+    block1 = Block(1, "Tx1: Alice -> Bob", "0")  # First block
+
+    # Print block data using f-strings
+    print(f"Block Index: {block1.index}")
+    print(f"Transactions: {block1.transactions}")
+    print(f"Previous Hash: {block1.previous_hash}")
+    print(f"Current Hash: {block1.hash}")
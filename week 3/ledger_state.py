@@ -0,0 +1,176 @@
+import json
+import os
+import re
+from collections import deque
+from decimal import Decimal
+
+from transaction import Transaction
+
+# "Alice pays Bob 10" or "Alice pays Bob 10.5 BTC"; anything else (e.g. "Genesis Block") moves no coins
+PAYMENT = re.compile(r"^\s*(\w+) pays (\w+) (\d+(?:\.\d+)?)(?:\s*BTC)?\s*$")
+
+
+def parse_payment(tx):
+    # (sender, receiver, amount) for a payment transaction (str or signed Transaction), else None
+    text = tx.payload if isinstance(tx, Transaction) else tx
+    match = PAYMENT.match(text)
+    if match is None:
+        return None
+    sender, receiver, amount = match.groups()
+    return sender, receiver, Decimal(amount)
+
+
+def block_deltas(block):
+    # Net balance change per account caused by one block
+    deltas = {}
+    for tx in block.transactions:
+        payment = parse_payment(tx)
+        if payment is None:
+            continue
+        sender, receiver, amount = payment
+        deltas[sender] = deltas.get(sender, 0) - amount
+        deltas[receiver] = deltas.get(receiver, 0) + amount
+    return deltas
+
+
+# -------------------------
+# LedgerState: account balances kept up to date block by block
+# -------------------------
+class LedgerState:
+    def __init__(self, snapshot_interval=1000, snapshot_path=None, max_undo=100, keep_snapshots=3):
+        """
+        Balances live in a dict, so balance() is O(1) instead of re-reading the whole chain.
+        Every applied block keeps its per-account deltas (for the last max_undo blocks), so
+        undoing a short reorg only reverses those deltas.
+        Every snapshot_interval blocks a copy of the balances is taken (the last keep_snapshots
+        stay in memory for deep reorgs); with snapshot_path it is also written to that file,
+        so a restart only replays the blocks after it (see catch_up).
+        """
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_path = snapshot_path
+        self.balances = {}  # account -> Decimal
+        self.blocks_applied = 0  # Blocks 0 .. blocks_applied - 1 are reflected in balances
+        self.tip_hash = None  # Hash of the last applied block
+        self._undo = deque(maxlen=max_undo)  # Per-block deltas, oldest first
+        self._snapshots = deque(maxlen=keep_snapshots)  # (blocks_applied, tip_hash, balances)
+        self._persisted = 0  # blocks_applied of the snapshot file
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self._load_snapshot()
+
+    def balance(self, account):
+        return self.balances.get(account, Decimal(0))
+
+    def _apply_deltas(self, deltas, sign=1):
+        balances = self.balances
+        for account, delta in deltas.items():
+            value = balances.get(account, 0) + sign * delta
+            if value:
+                balances[account] = value
+            else:
+                balances.pop(account, None)  # Keep the table limited to accounts holding coins
+
+    def apply_block(self, block):
+        # Apply the next block's payments; blocks must arrive in chain order
+        if block.index != self.blocks_applied:
+            raise ValueError(f"expected block {self.blocks_applied}, got block {block.index}")
+        deltas = block_deltas(block)
+        self._apply_deltas(deltas)
+        self._undo.append((block.index, deltas))
+        self.blocks_applied += 1
+        self.tip_hash = block.hash
+        if self.blocks_applied % self.snapshot_interval == 0:
+            self.snapshot()
+
+    def snapshot(self):
+        # Remember the current balances (and persist them if snapshot_path is set)
+        self._snapshots.append((self.blocks_applied, self.tip_hash, dict(self.balances)))
+        if self.snapshot_path is not None:
+            state = {
+                "blocks_applied": self.blocks_applied,
+                "tip_hash": self.tip_hash,
+                "balances": {account: str(value) for account, value in self.balances.items()},
+            }
+            # Write to a temporary name first so a crash never leaves a half-written snapshot
+            with open(self.snapshot_path + ".tmp", "w") as f:
+                json.dump(state, f)
+            os.replace(self.snapshot_path + ".tmp", self.snapshot_path)
+            self._persisted = self.blocks_applied
+
+    def _load_snapshot(self):
+        with open(self.snapshot_path) as f:
+            state = json.load(f)
+        self.blocks_applied = state["blocks_applied"]
+        self.tip_hash = state["tip_hash"]
+        self.balances = {account: Decimal(value) for account, value in state["balances"].items()}
+        self._snapshots.append((self.blocks_applied, self.tip_hash, dict(self.balances)))
+        self._persisted = self.blocks_applied
+
+    def _reset(self, blocks_applied=0, tip_hash=None, balances=None):
+        self.blocks_applied = blocks_applied
+        self.tip_hash = tip_hash
+        self.balances = dict(balances or {})
+        self._undo.clear()
+
+    def catch_up(self, chain):
+        """
+        Apply the blocks of `chain` that are not reflected yet, e.g. after loading a snapshot.
+        If the snapshot does not belong to this chain, the state is rebuilt from genesis.
+        """
+        if self.blocks_applied:
+            if self.blocks_applied > len(chain) or chain[self.blocks_applied - 1].hash != self.tip_hash:
+                self._reset()
+                self._snapshots.clear()
+        for height in range(self.blocks_applied, len(chain)):
+            self.apply_block(chain[height])
+
+    def revert_to(self, length, chain):
+        """
+        Undo blocks until only the first `length` blocks of `chain` are applied (a reorg).
+        Recent blocks are undone from their stored deltas; deeper reorgs restore the newest
+        snapshot at or below `length` and replay the blocks after it from `chain`.
+        """
+        if length > self.blocks_applied:
+            raise ValueError("cannot revert to a height that was never applied")
+        while self._undo and self.blocks_applied > length and self._undo[-1][0] == self.blocks_applied - 1:
+            _, deltas = self._undo.pop()
+            self._apply_deltas(deltas, sign=-1)
+            self.blocks_applied -= 1
+        if self.blocks_applied > length:
+            # Not enough undo history: start from the best snapshot (or genesis) and replay
+            while self._snapshots and self._snapshots[-1][0] > length:
+                self._snapshots.pop()
+            self._reset(*(self._snapshots[-1] if self._snapshots else ()))
+            for height in range(self.blocks_applied, length):
+                self.apply_block(chain[height])
+        self.tip_hash = chain[length - 1].hash if length else None
+
+        # Snapshots past the new tip describe blocks that are gone
+        while self._snapshots and self._snapshots[-1][0] > length:
+            self._snapshots.pop()
+        if self.snapshot_path is not None and self._persisted > length:
+            self.snapshot()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from merkle_tree import Blockchain
+
+    path = tempfile.mkdtemp()
+    chain = Blockchain(store_path=path)
+    names = ["Alice", "Bob", "Carol", "Dave", "Erin"]
+    for height in range(1, 2501):
+        chain.add_block([f"{names[i % 5]} pays {names[(i + height) % 5]} {i} BTC" for i in range(1, 6)])
+    print("Alice:", chain.get_balance("Alice"), "| Bob:", chain.get_balance("Bob"))
+
+    # Drop the last 3 blocks (undone from their deltas) and then 600 more (snapshot + replay)
+    chain.rollback(len(chain.chain) - 4)
+    chain.rollback(len(chain.chain) - 601)
+    print("After rollback to height", len(chain.chain) - 1, "Alice:", chain.get_balance("Alice"))
+    chain.store.close()
+
+    # Cold start: only the blocks after the last snapshot are replayed
+    start = time.time()
+    reopened = Blockchain(store_path=path)
+    print(f"Reopened in {(time.time() - start) * 1000:.1f} ms; Alice:", reopened.get_balance("Alice"))
@@ -0,0 +1,283 @@
+import asyncio
+import heapq
+import itertools
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from transaction import Transaction
+
+# Shared hashing helpers live in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+from hashing_basics import generate_hash  # noqa: E402
+
+
+def tx_hash(tx):
+    # Hash used to spot duplicates; equal to the transaction's Merkle leaf hash
+    return generate_hash(tx)
+
+
+# -------------------------
+# Mempool: pending transactions waiting to be put into a block
+# -------------------------
+class Mempool:
+    def __init__(self, max_size=10_000, order="fee", blockchain=None, remember_included=100_000):
+        """
+        max_size: pending transactions allowed; submit() waits for space when full (backpressure).
+        order: "fee" takes the highest fee first (ties by arrival), "arrival" is first come first served.
+        blockchain: if given, signed Transactions are verified on arrival with
+                    blockchain.admit_transaction, which fills its verified-signature cache.
+        remember_included: how many already-included tx hashes are remembered to reject replays.
+        """
+        if order not in ("fee", "arrival"):
+            raise ValueError("order must be 'fee' or 'arrival'")
+        self.max_size = max_size
+        self.order = order
+        self.blockchain = blockchain
+        self.remember_included = remember_included
+
+        self._heap = []  # (sort key, arrival number, tx hash, tx, size)
+        self._pending = set()  # Hashes of the transactions in the heap
+        self._in_flight = {}  # tx hash -> heap entry, taken for a block that is not committed yet
+        self._included = OrderedDict()  # Recently included hashes, oldest first
+        self._arrivals = itertools.count()
+        self._changed = asyncio.Condition()  # Signalled when transactions are added or taken
+        self.pending_bytes = 0
+
+        # Counters for metrics()
+        self.submitted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.backpressure_waits = 0
+        self.backpressure_seconds = 0.0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _known(self, h):
+        return h in self._pending or h in self._in_flight or h in self._included
+
+    async def submit(self, tx, fee=0):
+        """
+        Add a transaction (str or signed Transaction). Returns False for a duplicate or a bad
+        signature, True once it is queued. Waits while the mempool is full.
+        """
+        h = tx_hash(tx)
+        if self._known(h):
+            self.duplicates += 1
+            return False
+
+        if isinstance(tx, Transaction) and self.blockchain is not None:
+            # RSA verification runs in a worker thread so the event loop keeps serving other submits
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self.blockchain.admit_transaction, tx):
+                self.rejected += 1
+                return False
+
+        async with self._changed:
+            if len(self._heap) >= self.max_size:
+                self.backpressure_waits += 1
+                started = time.perf_counter()
+                await self._changed.wait_for(lambda: len(self._heap) < self.max_size)
+                self.backpressure_seconds += time.perf_counter() - started
+            # Checked again: the same transaction may have arrived while we were waiting
+            if self._known(h):
+                self.duplicates += 1
+                return False
+
+            arrival = next(self._arrivals)
+            key = -fee if self.order == "fee" else arrival
+            size = len(tx.encode())
+            heapq.heappush(self._heap, (key, arrival, h, tx, size))
+            self._pending.add(h)
+            self.pending_bytes += size
+            self.submitted += 1
+            self._changed.notify_all()
+        return True
+
+    async def take_batch(self, max_count, max_bytes=None, timeout=None):
+        """
+        Remove and return up to max_count transactions (and at most max_bytes of encoded
+        transactions) in mempool order. Waits up to `timeout` seconds (None = forever) for
+        the first transaction; returns an empty list if none arrived.
+        The batch stays "in flight" (duplicates are still rejected) until the caller reports
+        the outcome with mark_included(), requeue() or discard().
+        """
+        async with self._changed:
+            if not self._heap:
+                try:
+                    await asyncio.wait_for(self._changed.wait_for(lambda: self._heap), timeout)
+                except asyncio.TimeoutError:
+                    return []
+
+            batch = []
+            used_bytes = 0
+            while self._heap and len(batch) < max_count:
+                size = self._heap[0][4]
+                # Always take at least one transaction so an oversized one cannot block the pool
+                if max_bytes is not None and batch and used_bytes + size > max_bytes:
+                    break
+                entry = heapq.heappop(self._heap)
+                _, _, h, tx, size = entry
+                self._pending.discard(h)
+                self._in_flight[h] = entry
+                batch.append(tx)
+                used_bytes += size
+            self.pending_bytes -= used_bytes
+            self._changed.notify_all()  # Wake submitters waiting for space
+            return batch
+
+    def mark_included(self, transactions):
+        # The block holding these in-flight transactions was committed: remember them to reject replays
+        for tx in transactions:
+            h = tx_hash(tx)
+            if self._in_flight.pop(h, None) is not None:
+                self._included[h] = None
+        while len(self._included) > self.remember_included:
+            self._included.popitem(last=False)
+
+    def discard(self, transactions):
+        # Forget in-flight transactions that can never be included (e.g. bad signatures)
+        for tx in transactions:
+            self._in_flight.pop(tx_hash(tx), None)
+
+    async def requeue(self, transactions):
+        # Put in-flight transactions back with their original fee and arrival order (the block failed)
+        async with self._changed:
+            for tx in transactions:
+                entry = self._in_flight.pop(tx_hash(tx), None)
+                if entry is not None:
+                    heapq.heappush(self._heap, entry)
+                    self._pending.add(entry[2])
+                    self.pending_bytes += entry[4]
+            self._changed.notify_all()
+
+    def metrics(self):
+        return {
+            "depth": len(self._heap),
+            "in_flight": len(self._in_flight),
+            "pending_bytes": self.pending_bytes,
+            "capacity": self.max_size,
+            "submitted": self.submitted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "backpressure_waits": self.backpressure_waits,
+            "backpressure_seconds": self.backpressure_seconds,
+        }
+
+
+# -------------------------
+# BlockProducer: drains the mempool into blocks
+# -------------------------
+class BlockProducer:
+    def __init__(self, blockchain, mempool, max_txs=500, max_bytes=None, wait_timeout=1.0, executor=None):
+        """
+        Each block takes up to max_txs transactions / max_bytes bytes from the mempool.
+        Blockchain.add_block (Merkle root, signature checks and mining) runs in `executor`
+        (None = the event loop's default thread pool), so the event loop keeps accepting
+        transactions meanwhile. Mining itself uses blockchain.mining_workers processes.
+        """
+        self.blockchain = blockchain
+        self.mempool = mempool
+        self.max_txs = max_txs
+        self.max_bytes = max_bytes
+        self.wait_timeout = wait_timeout
+        self.executor = executor
+
+        self.blocks_produced = 0
+        self.transactions_included = 0
+        self.transactions_rejected = 0  # Dropped at block time because their signature did not verify
+        self.failed_blocks = 0  # add_block raised; the batch went back to the mempool
+        self.last_error = None
+        self.last_block_seconds = 0.0
+        self.total_block_seconds = 0.0
+
+    def _build_block(self, batch):
+        # Runs in the executor: drop transactions whose signature fails, then add the rest as a block.
+        # Returns the (valid, invalid) split; add_block may still raise, e.g. if mining fails
+        checks = iter(self.blockchain.signature_cache.verify([tx for tx in batch if isinstance(tx, Transaction)]))
+        ok = [next(checks) if isinstance(tx, Transaction) else True for tx in batch]
+        valid = [tx for tx, good in zip(batch, ok) if good]
+        invalid = [tx for tx, good in zip(batch, ok) if not good]
+        if valid:
+            self.blockchain.add_block(valid)
+        return valid, invalid
+
+    async def produce_block(self):
+        """
+        Build one block from the mempool. Returns the new block, or None if the mempool stayed
+        empty, every transaction was invalid or add_block failed (the batch is then requeued).
+        """
+        batch = await self.mempool.take_batch(self.max_txs, self.max_bytes, self.wait_timeout)
+        if not batch:
+            return None
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            valid, invalid = await loop.run_in_executor(self.executor, self._build_block, batch)
+        except Exception as error:
+            # Nothing was committed: return every transaction to the mempool and keep running
+            self.failed_blocks += 1
+            self.last_error = error
+            await self.mempool.requeue(batch)
+            return None
+        self.mempool.discard(invalid)
+        self.transactions_rejected += len(invalid)
+        if not valid:
+            return None
+        self.mempool.mark_included(valid)
+        self.last_block_seconds = time.perf_counter() - started
+        self.total_block_seconds += self.last_block_seconds
+
+        self.blocks_produced += 1
+        self.transactions_included += len(valid)
+        return self.blockchain.get_latest_block()
+
+    async def run(self, stop_event=None, max_blocks=None):
+        # Keep producing blocks until stop_event is set or max_blocks blocks were made;
+        # a failed block is counted in failed_blocks and does not stop the loop
+        while not (stop_event is not None and stop_event.is_set()):
+            if max_blocks is not None and self.blocks_produced >= max_blocks:
+                break
+            await self.produce_block()
+
+    def metrics(self):
+        metrics = self.mempool.metrics()
+        metrics.update({
+            "blocks_produced": self.blocks_produced,
+            "transactions_included": self.transactions_included,
+            "transactions_rejected": self.transactions_rejected,
+            "failed_blocks": self.failed_blocks,
+            "last_block_seconds": self.last_block_seconds,
+            "average_block_seconds": self.total_block_seconds / self.blocks_produced if self.blocks_produced else 0.0,
+        })
+        return metrics
+
+
+if __name__ == "__main__":
+    from merkle_tree import Blockchain
+
+    async def demo():
+        chain = Blockchain(difficulty=3)
+        mempool = Mempool(max_size=200, blockchain=chain)
+        producer = BlockProducer(chain, mempool, max_txs=100, wait_timeout=0.2)
+
+        async def wallet(name, count):
+            for i in range(count):
+                await mempool.submit(f"{name} pays Bob {i} BTC", fee=i % 7)
+                await mempool.submit(f"{name} pays Bob {i} BTC", fee=i % 7)  # Duplicate: dropped
+
+        stop = asyncio.Event()
+        production = asyncio.create_task(producer.run(stop))
+        await asyncio.gather(*(wallet(name, 150) for name in ("Alice", "Carol", "Dave", "Erin")))
+        while len(mempool):
+            await asyncio.sleep(0.01)
+        stop.set()
+        await production
+
+        print("Blocks:", len(chain.chain) - 1, "| valid:", chain.is_chain_valid())
+        print("Metrics:", producer.metrics())
+
+    asyncio.run(demo())
@@ -1,51 +1,93 @@
-import hashlib  # Import the hashlib library for SHA-256 hashing
+import hashlib  # Import hashlib to hash tree nodes directly in the per-node loop
+import os    # Import os to locate the week 2 folder
+import sys   # Import sys to make the week 2 folder importable
+import time  # Import time to time tree builds for the metrics
+from merkle_tree import DIGEST_SIZE, build_binary_merkle_layers  # Raw-digest tree builder
 
-# Simple SHA-256 hash function
-def sha256(data):
-    return hashlib.sha256(data.encode()).hexdigest()  # Encode string to bytes, hash it, and return hex string
+# Shared hashing helpers and hot-path metrics live in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+import chain_metrics  # noqa: E402
+from hashing_basics import generate_hash, hash_many  # noqa: E402
 
-# Recursive function to build one layer of the Merkle tree at a time
-def build_merkle_layer(layer):
-    if len(layer) == 1:
-        return [layer]  # Base case: only one hash left, return as root layer
-
-    # If the number of nodes is odd, duplicate the last node to make it even
-    if len(layer) % 2 == 1:
-        layer.append(layer[-1])
-
-    next_layer = []  # This will hold the parent nodes of the current layer
+# Simple SHA-256 hash function: string in, hex string out
+sha256 = generate_hash
 
-    # Iterate over the layer two elements at a time
-    for i in range(0, len(layer), 2):
-        combined = layer[i] + layer[i + 1]  # Concatenate two sibling hashes
-        next_layer.append(sha256(combined))  # Hash the concatenated string and add to the next layer
+# Build the Merkle tree one layer at a time, bottom-up, and return all layers
+def build_merkle_layer(layer):
+    layers = [layer]  # Layers are appended in place, never re-copied
+    new = hashlib.sha256  # Bound once: the loop below runs for every node of the tree
 
-    # Recursively build the next layer and prepend the current layer to the result
-    return [layer] + build_merkle_layer(next_layer)
+    while len(layer) > 1:
+        # If the number of nodes is odd, duplicate the last node to make it even
+        if len(layer) % 2 == 1:
+            layer.append(layer[-1])
 
-# Build full Merkle tree from list of transactions and return all layers (bottom-up)
-def build_merkle_tree(transactions):
-    leaf_hashes = [sha256(tx) for tx in transactions]  # Hash each transaction (leaf nodes)
-    return build_merkle_layer(leaf_hashes)  # Build the full Merkle tree using the leaf hashes
+        next_layer = []  # This will hold the parent nodes of the current layer
+
+        # Iterate over the layer two elements at a time
+        for i in range(0, len(layer), 2):
+            combined = layer[i] + layer[i + 1]  # Concatenate two sibling hashes
+            next_layer.append(new(combined.encode()).hexdigest())  # Hash the concatenated string and add to the next layer
+
+        layers.append(next_layer)
+        layer = next_layer  # Continue with the parents until only the root is left
+
+    return layers
+
+# Parent hash of two hex child hashes; binary mode hashes their raw 32-byte digests
+def hash_pair(left, right, binary=False):
+    if binary:
+        return generate_hash(bytes.fromhex(left) + bytes.fromhex(right))
+    return sha256(left + right)
+
+# Read-only view of one binary layer that hands out nodes as hex strings,
+# so proofs look the same in both modes and hex is only produced for nodes actually read
+class BinaryLayer:
+    def __init__(self, data):
+        self.data = data  # bytearray of back-to-back 32-byte digests
+
+    def __len__(self):
+        return len(self.data) // DIGEST_SIZE
+
+    def __getitem__(self, i):
+        return self.data[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE].hex()
+
+# Build full Merkle tree from list of transactions and return all layers (bottom-up).
+# binary=True builds the raw-digest tree (see merkle_tree.build_merkle_root for the
+# compatibility note: its root differs from the default hex-concatenation root).
+def build_merkle_tree(transactions, binary=False):
+    started = time.perf_counter() if chain_metrics.ENABLED else 0.0
+    if binary:
+        layers = [BinaryLayer(layer) for layer in build_binary_merkle_layers(transactions)]
+    else:
+        leaf_hashes = hash_many(transactions)  # Hash each transaction (leaf nodes)
+        layers = build_merkle_layer(leaf_hashes)  # Build the full Merkle tree using the leaf hashes
+    if chain_metrics.ENABLED:
+        chain_metrics.record_merkle_tree("merkle_proof_tree_seconds", time.perf_counter() - started, len(transactions))
+    return layers
 
 # Generate Merkle proof for a specific transaction (by index)
-def get_merkle_proof(transactions, index):
-    tree_layers = build_merkle_tree(transactions)  # Build the full tree
+def get_merkle_proof(transactions, index, binary=False):
+    tree_layers = build_merkle_tree(transactions, binary)  # Build the full tree
+    return proof_from_layers(tree_layers, index)  # Walk it from the leaf to the root
+
+# Read the proof for one leaf out of an already built tree (layers are not modified)
+def proof_from_layers(tree_layers, index):
     proof = []  # Will store the proof: list of (sibling_hash, is_left) tuples
     pos = index  # Current index at each level
 
     # Loop through each layer except the top (root)
     for layer in tree_layers[:-1]:
-        # If the number of nodes is odd, duplicate the last node to make even
-        if len(layer) % 2 == 1:
-            layer.append(layer[-1])
-
         # Determine if current node is a right child (odd index)
         is_left = pos % 2 == 1
 
         # Find the sibling index
         sibling_index = pos - 1 if is_left else pos + 1
 
+        # Odd number of nodes: the last node is paired with a copy of itself
+        if sibling_index == len(layer):
+            sibling_index = pos
+
         # Add sibling hash and whether sibling is on the left to the proof
         proof.append((layer[sibling_index], is_left))
 
@@ -54,47 +96,130 @@ def get_merkle_proof(transactions, index):
 
     return proof  # Return the Merkle proof list
 
+# Generate proofs for many transactions (all of them by default) from a single tree build
+def get_merkle_proofs(transactions, indices=None, binary=False):
+    tree_layers = build_merkle_tree(transactions, binary)
+    if indices is None:
+        indices = range(len(transactions))
+    return [proof_from_layers(tree_layers, index) for index in indices]
+
+# Number of real (non-duplicated) nodes in every layer of a tree with leaf_count leaves
+def _layer_sizes(leaf_count):
+    sizes = [leaf_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+# Compact proof for several transactions at once: each sibling hash is stored only once,
+# and hashes the verifier can compute itself from the proven leaves are left out
+def get_merkle_multiproof(transactions, indices, binary=False):
+    tree_layers = build_merkle_tree(transactions, binary)
+    indices = sorted(set(indices))
+    hashes = []
+    known = indices  # Positions the verifier can compute at the current level
+
+    for layer, size in zip(tree_layers[:-1], _layer_sizes(len(transactions))):
+        known_set = set(known)
+        for pos in known:
+            sibling = pos ^ 1  # Flip the lowest bit: 4 <-> 5, 7 <-> 6
+            # Sibling past the end is the duplicated node, which the verifier already has
+            if sibling < size and sibling not in known_set:
+                hashes.append(layer[sibling])
+        # Parents of the known nodes are known at the next level
+        known = sorted(set(pos // 2 for pos in known))
+
+    return {"leaf_count": len(transactions), "indices": indices, "hashes": hashes}
+
 # Function to verify a transaction using its Merkle proof and root
-def verify_transaction(tx, proof, merkle_root):
+def verify_transaction(tx, proof, merkle_root, binary=False):
     current_hash = sha256(tx)  # Start by hashing the transaction data
 
     # Loop through the proof steps to reconstruct the path to the root
     for sibling_hash, is_left in proof:
         if is_left:
             # If sibling is on the left, concatenate it before current hash
-            current_hash = sha256(sibling_hash + current_hash)
+            current_hash = hash_pair(sibling_hash, current_hash, binary)
         else:
             # If sibling is on the right, concatenate after current hash
-            current_hash = sha256(current_hash + sibling_hash)
+            current_hash = hash_pair(current_hash, sibling_hash, binary)
 
     # After applying all proof steps, current_hash should equal the Merkle root
     return current_hash == merkle_root
 
 
-# --- MAIN TEST SECTION ---
-
-# Sample transactions (leaves of the Merkle tree)
-transactions = [
-    "Alice pays Bob 10 BTC",
-    "Bob pays Charlie 5 BTC",
-    "Charlie pays Dave 2 BTC",
-    "Dave pays Eve 1 BTC"
-]
+# Verify several (transaction, proof) pairs against one root, one result per pair
+def verify_transactions(txs, proofs, merkle_root, binary=False):
+    return [verify_transaction(tx, proof, merkle_root, binary) for tx, proof in zip(txs, proofs)]
+
+# Verify a multiproof: txs must be given in the order of multiproof["indices"]
+def verify_multiproof(txs, multiproof, merkle_root, binary=False):
+    indices = multiproof["indices"]
+    if len(txs) != len(indices):
+        return False
+
+    hashes = iter(multiproof["hashes"])
+    # Hashes known at the current level, by position
+    known = {index: sha256(tx) for index, tx in zip(indices, txs)}
+
+    try:
+        for size in _layer_sizes(multiproof["leaf_count"])[:-1]:
+            parents = {}
+            for pos in sorted(known):
+                parent = pos // 2
+                if parent in parents:
+                    continue  # Already combined together with its left sibling
+                sibling = pos ^ 1
+                if sibling >= size:
+                    sibling_hash = known[pos]  # Odd layer: paired with itself
+                elif sibling in known:
+                    sibling_hash = known[sibling]
+                else:
+                    sibling_hash = next(hashes)  # Supplied by the proof, in generation order
+                if pos % 2 == 1:
+                    parents[parent] = hash_pair(sibling_hash, known[pos], binary)
+                else:
+                    parents[parent] = hash_pair(known[pos], sibling_hash, binary)
+            known = parents
+    except StopIteration:
+        return False  # Proof is missing hashes
+
+    # Every supplied hash must have been used and we must end at the root
+    return next(hashes, None) is None and known.get(0) == merkle_root
 
-# Build the Merkle tree and extract all layers
-layers = build_merkle_tree(transactions)
-
-# The Merkle root is the only hash in the final layer
-merkle_root = layers[-1][0]
-print("Merkle Root:", merkle_root)
-
-# Choose transaction index 0 for proof generation (Alice pays Bob)
-tx_index = 0
-
-# Generate the Merkle proof for the selected transaction
-proof = get_merkle_proof(transactions, tx_index)
-print("Generated Merkle Proof for Tx0:", proof)
+# --- MAIN TEST SECTION ---
 
-# Use the Merkle proof to verify the transaction's inclusion
-is_verified = verify_transaction(transactions[tx_index], proof, merkle_root)
-print("Tx0 Verified?", is_verified)
+if __name__ == "__main__":
+    # Sample transactions (leaves of the Merkle tree)
+    transactions = [
+        "Alice pays Bob 10 BTC",
+        "Bob pays Charlie 5 BTC",
+        "Charlie pays Dave 2 BTC",
+        "Dave pays Eve 1 BTC"
+    ]
+
+    # Build the Merkle tree and extract all layers
+    layers = build_merkle_tree(transactions)
+
+    # The Merkle root is the only hash in the final layer
+    merkle_root = layers[-1][0]
+    print("Merkle Root:", merkle_root)
+
+    # Choose transaction index 0 for proof generation (Alice pays Bob)
+    tx_index = 0
+
+    # Generate the Merkle proof for the selected transaction
+    proof = get_merkle_proof(transactions, tx_index)
+    print("Generated Merkle Proof for Tx0:", proof)
+
+    # Use the Merkle proof to verify the transaction's inclusion
+    is_verified = verify_transaction(transactions[tx_index], proof, merkle_root)
+    print("Tx0 Verified?", is_verified)
+
+    # Proofs for every transaction from one tree build, checked in one call
+    all_proofs = get_merkle_proofs(transactions)
+    print("All transactions verified?", all(verify_transactions(transactions, all_proofs, merkle_root)))
+
+    # One compact proof covering Tx0 and Tx1: their shared sibling path is stored once
+    multiproof = get_merkle_multiproof(transactions, [0, 1])
+    print("Multiproof hashes:", len(multiproof["hashes"]), "instead of", len(all_proofs[0]) + len(all_proofs[1]))
+    print("Tx0 + Tx1 verified by multiproof?", verify_multiproof(transactions[:2], multiproof, merkle_root))
@@ -1,53 +1,514 @@
 import hashlib
+import json
+import os
+import sys
 import time
+from collections import OrderedDict
 
-# Calculate SHA-256 hash of given data
-def sha256(data):
-    return hashlib.sha256(data.encode()).hexdigest()
+from block_store import BlockStore, StoredChain
+from ledger_state import LedgerState
+from transaction import Transaction, VerifiedSignatureCache
 
-# Recursively build Merkle Tree layers until root is reached
-def build_merkle_layer(layer):
-    if len(layer) == 1:
-        return layer  # Root reached
+# The shared hashing helpers live in week 2, the mining engine with the other consensus code in week 4
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 4"))
+import chain_metrics  # noqa: E402
+from hashing_basics import generate_hash, hash_many  # noqa: E402
+from packed_fields import DIGEST, FLOAT, INT, PackedFields  # noqa: E402
+from pow_simulation import difficulty_target, proof_of_work  # noqa: E402
+
+# Calculate SHA-256 hash of given data (hex string)
+sha256 = generate_hash
 
-    # Duplicate last element if odd number of nodes
-    if len(layer) % 2 == 1:
-        layer.append(layer[-1])
+# Build Merkle Tree layers until root is reached (a loop, so no recursion depth limit)
+def build_merkle_layer(layer):
+    new = hashlib.sha256
+    while len(layer) > 1:
+        # Duplicate last element if odd number of nodes
+        if len(layer) % 2 == 1:
+            layer.append(layer[-1])
 
-    next_layer = []
-    for i in range(0, len(layer), 2):
-        combined = layer[i] + layer[i + 1]
-        next_layer.append(sha256(combined))
+        # Replace the layer with its parents; only the current layer is kept alive.
+        # hashlib is called directly: this loop runs once per tree node
+        layer = [new((layer[i] + layer[i + 1]).encode()).hexdigest() for i in range(0, len(layer), 2)]
 
-    # Recursive call for next layer
-    return build_merkle_layer(next_layer)
+    return layer  # Root reached
 
 # Compute Merkle root for a list of transactions
-def build_merkle_root(transactions):
+def build_merkle_root(transactions, binary=False):
+    """
+    binary=False (default) is the compatibility mode: parents hash the concatenated
+    64-character hex strings of their children, giving the roots this project always had.
+    binary=True hashes the raw 32-byte digests instead (the Bitcoin-style layout). It feeds
+    half the bytes to SHA-256 and never builds per-node strings, but the roots differ
+    from hex mode, so a chain must stick to one mode.
+    """
     if not transactions:
         return ""
-    initial_layer = [sha256(tx) for tx in transactions]
-    root_layer = build_merkle_layer(initial_layer)
-    return root_layer[0]
+    started = time.perf_counter() if chain_metrics.ENABLED else 0.0
+    if binary:
+        root = build_binary_merkle_layers(transactions)[-1].hex()
+    else:
+        initial_layer = hash_many(transactions)  # Large batches are hashed on a thread pool
+        root = build_merkle_layer(initial_layer)[0]
+    if chain_metrics.ENABLED:
+        chain_metrics.record_merkle_tree("merkle_root_seconds", time.perf_counter() - started, len(transactions))
+    return root
+
+# Size of one SHA-256 digest in bytes
+DIGEST_SIZE = 32
+
+# Build every layer of a binary Merkle tree, bottom-up.
+# Each layer is one bytearray of back-to-back 32-byte digests; odd layers get their last
+# digest duplicated like build_merkle_layer does. The last layer is the 32-byte root.
+def build_binary_merkle_layers(transactions):
+    new = hashlib.sha256  # Called directly in the per-node loop
+    layer = bytearray().join(hash_many(transactions, raw=True))
+
+    layers = [layer]
+    while len(layer) > DIGEST_SIZE:
+        if len(layer) % (2 * DIGEST_SIZE):
+            layer += layer[-DIGEST_SIZE:]  # Duplicate last node if odd number of nodes
+        view = memoryview(layer)  # Slicing a memoryview hashes sibling pairs without copying
+        next_layer = bytearray()
+        for i in range(0, len(layer), 2 * DIGEST_SIZE):
+            next_layer += new(view[i:i + 2 * DIGEST_SIZE]).digest()
+        view.release()
+        layer = next_layer
+        layers.append(layer)
+    return layers
+
+# Compute the same root as build_merkle_root from any iterable of transactions
+# (a generator, a file reader...) without ever holding the leaf list in memory
+def stream_merkle_root(transactions, binary=False):
+    """
+    Only a frontier of at most one pending node per level is kept, so memory is
+    O(log n) however many transactions are streamed. Complete sibling pairs are hashed
+    as soon as both exist; the unpaired right edge is finished at the end using the same
+    duplicate-the-last-node rule as build_merkle_layer. binary works as in build_merkle_root.
+    """
+    new = hashlib.sha256  # Parents are hashed directly: there is one per leaf
+    if binary:
+        def leaf(tx):
+            return generate_hash(tx, raw=True)
+
+        def parent(left, right):
+            return new(left + right).digest()
+    else:
+        leaf = sha256
+
+        def parent(left, right):
+            return new((left + right).encode()).hexdigest()
+
+    started = time.perf_counter() if chain_metrics.ENABLED else 0.0
+    frontier = []  # frontier[k]: left node at level k still waiting for its right sibling
+    count = 0
+    for tx in transactions:
+        node = leaf(tx)
+        count += 1
+        level = 0
+        # Carry upwards like a binary counter: every completed pair makes a parent
+        while level < len(frontier) and frontier[level] is not None:
+            node = parent(frontier[level], node)
+            frontier[level] = None
+            level += 1
+        if level == len(frontier):
+            frontier.append(None)
+        frontier[level] = node
+
+    if count == 0:
+        return ""
+
+    # Close the right edge: at each level the last node is either a pending left node,
+    # a node carried up from below, or both; a lone last node is paired with itself
+    carry = None
+    level = 0
+    size = count  # Number of nodes at the current level
+    while size > 1:
+        pending = frontier[level] if level < len(frontier) else None
+        if pending is not None and carry is not None:
+            carry = parent(pending, carry)
+        elif pending is not None:
+            carry = parent(pending, pending)
+        elif carry is not None:
+            carry = parent(carry, carry)
+        size = (size + 1) // 2
+        level += 1
+
+    root = carry if carry is not None else frontier[level]
+    if chain_metrics.ENABLED:
+        chain_metrics.record_merkle_tree("merkle_root_seconds", time.perf_counter() - started, count,
+                                         leaves_counted=False)
+    return root.hex() if binary else root
+
+# Merkle tree that keeps every layer so appends and leaf updates only rehash one path
+class IncrementalMerkleTree:
+    """
+    Cached Merkle tree giving the same root as build_merkle_root.
+    layers[0] holds the leaf hashes and layers[-1] the root. An odd node is paired
+    with itself, which is what build_merkle_layer's duplication of the last node does,
+    so append(), update() and root() all run in O(log n).
+    """
+
+    def __init__(self, transactions=()):
+        self.layers = [[]]
+        for tx in transactions:
+            self.append(tx)
+
+    def __len__(self):
+        return len(self.layers[0])
+
+    def append(self, transaction):
+        # Add a new leaf at the end and return its index
+        self.layers[0].append(sha256(transaction))
+        index = len(self.layers[0]) - 1
+        self._rehash_path(index)
+        return index
+
+    def update(self, index, transaction):
+        # Replace the transaction at index and refresh the hashes above it
+        self.layers[0][index] = sha256(transaction)
+        self._rehash_path(index)
+
+    def root(self):
+        if not self.layers[0]:
+            return ""
+        return self.layers[-1][0]
+
+    def _rehash_path(self, index):
+        level = 0
+        # Walk up until we reach a layer with a single node: that node is the root
+        while len(self.layers[level]) > 1:
+            layer = self.layers[level]
+            left = index - index % 2
+            # Missing right sibling: pair the last node with itself
+            right = left + 1 if left + 1 < len(layer) else left
+            parent = sha256(layer[left] + layer[right])
+
+            if level + 1 == len(self.layers):
+                self.layers.append([])  # Tree just grew a new level
+            next_layer = self.layers[level + 1]
+            index //= 2
+            if index == len(next_layer):
+                next_layer.append(parent)
+            else:
+                next_layer[index] = parent
+            level += 1
 
 # Block class representing each block in the blockchain
-class Block:
-    def __init__(self, index, transactions, previous_hash):
-        self.index = index
-        self.timestamp = time.time()
+class Block(PackedFields):
+    # The whole header sits in one packed 128-byte record: the three hashes as raw 32-byte
+    # digests and the numbers as 8-byte fields, read back as hex strings and ints.
+    # Transactions are covered through merkle_root.
+    PACKED_FIELDS = (("index", INT), ("timestamp", FLOAT), ("merkle_root", DIGEST), ("previous_hash", DIGEST),
+                     ("difficulty", INT), ("nonce", INT), ("hash", DIGEST))
+    __slots__ = ("transactions",)
+
+    def __init__(self, index, transactions, previous_hash, difficulty=0, nonce=0):
+        timestamp = time.time()
         self.transactions = transactions
-        self.merkle_root = build_merkle_root(transactions)
-        self.previous_hash = previous_hash
-        self.hash = self.calculate_hash()
+        merkle_root = build_merkle_root(transactions)
+        # difficulty = leading zero hex digits the hash must have (0 = unmined block)
+        header = self._header(index, timestamp, merkle_root, previous_hash, difficulty, nonce)
+        self._pack(index, timestamp, merkle_root, previous_hash, difficulty, nonce, generate_hash(header, raw=True))
+
+    @staticmethod
+    def _header(index, timestamp, merkle_root, previous_hash, difficulty, nonce):
+        if difficulty:
+            return f"{index}{timestamp}{merkle_root}{previous_hash}{difficulty}:{nonce}".encode()
+        # Unmined blocks keep the original header, so their hashes are unchanged
+        return f"{index}{timestamp}{merkle_root}{previous_hash}".encode()
+
+    def header_prefix(self):
+        # Everything in the header except the nonce; mining hashes this prefix + nonce digits
+        index, timestamp, merkle_root, previous_hash, difficulty = self._values()[:5]
+        return f"{index}{timestamp}{merkle_root}{previous_hash}{difficulty}:".encode()
+
+    def header_bytes(self):
+        # Canonical header encoding that gets hashed, rebuilt from the packed fields
+        return self._header(*self._values()[:-1])
 
     def calculate_hash(self):
-        block_string = f"{self.index}{self.timestamp}{self.merkle_root}{self.previous_hash}"
-        return sha256(block_string)
+        return generate_hash(self.header_bytes())
+
+    def meets_target(self, difficulty=None):
+        # True when the stored hash has `difficulty` leading zero hex digits (default: the ones it claims)
+        return bytes.fromhex(self.hash) < difficulty_target(self.difficulty if difficulty is None else difficulty)
+
+    def mine(self, workers=1, max_nonce=2**32):
+        """
+        Search for a nonce that makes the header hash meet the difficulty target,
+        using the midstate (and, with workers != 1, multi-process) search from pow_simulation.
+        Sets nonce and hash and returns the mining stats (hashes, duration, hash_rate, workers);
+        duration covers the nonce search only, not starting or stopping worker processes.
+        Only about two chunks per worker are queued at a time, so the 2**32 nonce bound costs
+        nothing when a nonce is found early.
+        """
+        stats = {}
+        nonce, hash_result, _ = proof_of_work(self.header_prefix(), self.difficulty, max_nonce,
+                                              workers=workers, stats=stats)
+        if nonce is None:
+            raise ValueError(f"no nonce below {max_nonce} meets difficulty {self.difficulty}")
+        self.nonce = nonce
+        self.hash = hash_result
+        return stats
+
+    def to_bytes(self):
+        # Serialize every field (including the stored hash) for the block store
+        return json.dumps({
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "transactions": [
+                tx.to_dict() if isinstance(tx, Transaction) else tx for tx in self.transactions
+            ],
+            "merkle_root": self.merkle_root,
+            "previous_hash": self.previous_hash,
+            "difficulty": self.difficulty,
+            "nonce": self.nonce,
+            "hash": self.hash,
+        }).encode()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        # Rebuild a stored block exactly as saved: no new timestamp, no recomputed hashes
+        fields = json.loads(payload)
+        block = cls.__new__(cls)
+        block.transactions = [
+            Transaction.from_dict(tx) if isinstance(tx, dict) else tx for tx in fields["transactions"]
+        ]
+        block._pack(fields["index"], fields["timestamp"], fields["merkle_root"], fields["previous_hash"],
+                    fields.get("difficulty", 0), fields.get("nonce", 0), fields["hash"])
+        return block
+
+# Number of blocks per task when validation runs in a process pool
+VALIDATION_CHUNK_SIZE = 10_000
+
+# Outcome of Blockchain.validate: every failing height with the reason it failed
+class ValidationResult:
+    def __init__(self, errors):
+        self.errors = errors  # list of (height, reason), sorted by height
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def __bool__(self):
+        return self.valid
+
+    def __repr__(self):
+        return f"ValidationResult(valid={self.valid}, errors={self.errors})"
+
+# Check blocks[1:] (which start at height `first`) against their stored hash, their predecessor
+# and the chain's required difficulty (a block cannot lower the difficulty it has to meet)
+def _validate_blocks(first, blocks, required_difficulty):
+    errors = []
+    for offset in range(1, len(blocks)):
+        current = blocks[offset]
+        previous = blocks[offset - 1]
+        height = first + offset - 1
+
+        # Always re-hash the header: an audit must not trust anything cached with the block
+        if current.hash != generate_hash(current.header_bytes()):
+            errors.append((height, "hash mismatch"))
+        if current.merkle_root != build_merkle_root(current.transactions):
+            errors.append((height, "merkle root mismatch"))  # Transactions changed or swapped
+        if current.previous_hash != previous.hash:
+            errors.append((height, "previous hash mismatch"))
+        if current.difficulty < required_difficulty:
+            errors.append((height, "difficulty below chain requirement"))
+        difficulty = max(current.difficulty, required_difficulty)
+        if difficulty and not current.meets_target(difficulty):
+            errors.append((height, "insufficient proof of work"))
+    return errors
+
+_worker_stores = {}  # store path -> read-only BlockStore, opened once per validation worker
+
+def _validate_chunk(args):
+    """
+    Validate heights [first, stop). `source` is either the blocks first - 1 .. stop - 1 themselves
+    or the path of the chain's BlockStore, in which case the worker reads and decodes its own range
+    so the parent never holds more than a chunk of blocks.
+    Returns (errors, signed) where signed lists the (height, Transaction) pairs whose signatures
+    the caller still has to check: the verified-signature cache lives in the parent process.
+    """
+    first, stop, source, required_difficulty = args
+    if isinstance(source, str):
+        store = _worker_stores.get(source)
+        if store is None:
+            store = _worker_stores[source] = BlockStore(source, read_only=True)
+        blocks = [Block.from_bytes(store.get(height)) for height in range(first - 1, stop)]
+    else:
+        blocks = source
+    signed = [(block.index, tx) for block in blocks[1:] for tx in block.transactions
+              if isinstance(tx, Transaction)]
+    return _validate_blocks(first, blocks, required_difficulty), signed
+
+# LRU cache of per-block Merkle layers, bounded by the total number of hashes it holds
+class MerkleLayerCache:
+    def __init__(self, max_nodes=1_000_000):
+        self.max_nodes = max_nodes  # About 140 bytes per hex hash string, so ~140 MB by default
+        self.nodes = 0
+        self._layers = OrderedDict()  # block hash -> (layers, node count)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def get(self, block_hash):
+        entry = self._layers.get(block_hash)
+        if entry is None:
+            return None
+        self._layers.move_to_end(block_hash)  # Mark as recently used
+        return entry[0]
+
+    def put(self, block_hash, layers):
+        count = sum(len(layer) for layer in layers)
+        if block_hash in self._layers:
+            self.nodes -= self._layers.pop(block_hash)[1]
+        self._layers[block_hash] = (layers, count)
+        self.nodes += count
+        # Evict least recently used blocks, but always keep the one just added
+        while self.nodes > self.max_nodes and len(self._layers) > 1:
+            _, (_, evicted) = self._layers.popitem(last=False)
+            self.nodes -= evicted
 
 # Blockchain class managing the chain of blocks
 class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
+    def __init__(self, store_path=None, difficulty=0, mining_workers=1):
+        """
+        Without store_path the chain is an in-memory list, as before.
+        With store_path blocks are persisted in a BlockStore in that directory, the chain
+        survives restarts, and self.chain becomes a lazy read-only view over the store.
+        difficulty > 0 makes add_block mine every new block (mining_workers processes,
+        None = every core); difficulty 0 adds blocks without proof of work as before.
+        """
+        self.difficulty = difficulty
+        self.mining_workers = mining_workers
+        self.mining_stats = {}  # height -> stats of the mining run that produced that block
+        self.verified_height = 0  # Highest height known valid; genesis is trusted
+        # Transactions whose signatures already verified, so they are not RSA-checked twice
+        self.signature_cache = VerifiedSignatureCache()
+        # Secondary indexes, filled as blocks are appended (or caught up after reopening a store)
+        self._block_index = {}  # block hash -> height
+        self._tx_index = {}  # tx hash -> (height, leaf index) of its latest occurrence
+        self._tx_shadowed = {}  # tx hash -> earlier occurrences (oldest first), restored by rollback
+        self._indexed_height = 0  # Blocks below this height are in the indexes
+        self.merkle_cache = MerkleLayerCache()
+        if store_path is None:
+            self.store = None
+            self.state = LedgerState()  # Account balances, updated as blocks are appended
+            self.chain = []
+            self._append(self.create_genesis_block())
+            return
+
+        self.store = BlockStore(store_path)
+        self.chain = StoredChain(self.store, Block.from_bytes)
+        # Balances are snapshotted next to the blocks; reopening only replays blocks after the snapshot
+        self.state = LedgerState(snapshot_path=os.path.join(store_path, "state-snapshot.json"))
+        self.state.catch_up(self.chain)
+        if len(self.store) == 0:
+            self._append(self.create_genesis_block())
+
+    def _append(self, block):
+        if self.store is None:
+            self.chain.append(block)
+        else:
+            self.store.append(block.hash, block.to_bytes())
+        if self._indexed_height == block.index:
+            self._index_block(block)  # Indexes are up to date: just add the new block
+        self.state.apply_block(block)
+
+    def _index_block(self, block):
+        self._block_index[block.hash] = block.index
+        for leaf_index, tx in enumerate(block.transactions):
+            tx_hash = sha256(tx)
+            earlier = self._tx_index.get(tx_hash)
+            if earlier is not None:
+                self._tx_shadowed.setdefault(tx_hash, []).append(earlier)  # Same transaction seen before
+            self._tx_index[tx_hash] = (block.index, leaf_index)
+        self._indexed_height = block.index + 1
+
+    def _update_indexes(self):
+        # Index blocks not seen yet, e.g. the genesis block or a chain reopened from a store
+        for height in range(self._indexed_height, len(self.chain)):
+            self._index_block(self.chain[height])
+
+    def get_balance(self, account):
+        # O(1): read from the ledger state instead of re-parsing every block
+        return self.state.balance(account)
+
+    def rollback(self, height):
+        """
+        Drop every block above `height`, e.g. to switch to a competing fork; the fork's blocks
+        are then added with add_block. Balances, indexes and the store are rolled back too.
+        """
+        if not 0 <= height < len(self.chain):
+            raise IndexError("rollback height out of range (the genesis block always stays)")
+        length = height + 1
+        self.state.revert_to(length, self.chain)
+
+        # Undo the indexing of the removed blocks in reverse order, so a transaction that also
+        # appears in a kept block points at that earlier occurrence again
+        for block in reversed(self.chain[length:self._indexed_height]):
+            self._block_index.pop(block.hash, None)
+            for tx in reversed(block.transactions):
+                tx_hash = sha256(tx)
+                earlier = self._tx_shadowed.get(tx_hash)
+                if earlier:
+                    self._tx_index[tx_hash] = earlier.pop()
+                    if not earlier:
+                        del self._tx_shadowed[tx_hash]
+                else:
+                    self._tx_index.pop(tx_hash, None)
+        self._indexed_height = min(self._indexed_height, length)
+
+        if self.store is None:
+            del self.chain[length:]
+        else:
+            self.store.truncate(length)
+        self.mining_stats = {h: stats for h, stats in self.mining_stats.items() if h < length}
+        self.verified_height = min(self.verified_height, height)
+
+    def get_block_by_hash(self, block_hash):
+        # O(1) lookup through the block-hash index
+        if self.store is not None:
+            height = self.store.height_of(block_hash)  # The store keeps its own hash index
+        else:
+            self._update_indexes()
+            height = self._block_index.get(block_hash)
+        return None if height is None else self.chain[height]
+
+    def find_transaction(self, tx_hash):
+        # (height, leaf index) of the transaction with this hash, or None if it is not in the chain
+        self._update_indexes()
+        return self._tx_index.get(tx_hash)
+
+    def get_transaction_proof(self, tx_hash):
+        """
+        Inclusion proof for a transaction, looked up by its hash (its Merkle leaf hash).
+        Returns None for an unknown transaction, otherwise a dict with the block height and hash,
+        the leaf index, the block's Merkle root and the proof for merkle_proof.verify_transaction.
+        The block's Merkle layers are built once and kept in self.merkle_cache, so later proofs
+        from the same block only walk O(log n) layers.
+        """
+        location = self.find_transaction(tx_hash)
+        if location is None:
+            return None
+        height, leaf_index = location
+        block = self.chain[height]
+
+        from merkle_proof import build_merkle_tree, proof_from_layers  # merkle_proof imports this module
+
+        layers = self.merkle_cache.get(block.hash)
+        if layers is None:
+            layers = build_merkle_tree(list(block.transactions))
+            self.merkle_cache.put(block.hash, layers)
+        return {
+            "height": height,
+            "block_hash": block.hash,
+            "leaf_index": leaf_index,
+            "merkle_root": block.merkle_root,
+            "proof": proof_from_layers(layers, leaf_index),
+        }
 
     def create_genesis_block(self):
         return Block(0, ["Genesis Block"], "0")
@@ -55,25 +516,100 @@ class Blockchain:
     def get_latest_block(self):
         return self.chain[-1]
 
+    def admit_transaction(self, transaction):
+        # Verify a signed transaction on arrival (mempool admission) and remember the result
+        return self.signature_cache.verify([transaction])[0]
+
+    def _invalid_signatures(self, signed):
+        # Heights (in order) of the (height, Transaction) pairs whose signature does not verify
+        results = self.signature_cache.verify([tx for _, tx in signed])
+        return sorted(set(height for (height, _), ok in zip(signed, results) if not ok))
+
     def add_block(self, transactions):
+        """
+        Append a block of transactions: plain strings and/or signed Transaction objects.
+        Signatures already verified at admission are not checked again.
+        After chain_metrics.enable_profiling(), sampled blocks are built under cProfile.
+        """
+        if chain_metrics.PROFILER is not None:
+            return chain_metrics.PROFILER.run(self._add_block, transactions)
+        return self._add_block(transactions)
+
+    def _add_block(self, transactions):
+        started = time.perf_counter()
+        new_block_index = len(self.chain)
+        signed = [tx for tx in transactions if isinstance(tx, Transaction)]
+        if signed and not all(self.signature_cache.verify(signed)):
+            raise ValueError(f"block {new_block_index} has a transaction with an invalid signature")
+
         previous_block = self.get_latest_block()
-        new_block = Block(len(self.chain), transactions, previous_block.hash)
-        self.chain.append(new_block)
+        new_block = Block(len(self.chain), transactions, previous_block.hash, self.difficulty)
+        if self.difficulty:
+            self.mining_stats[new_block.index] = new_block.mine(self.mining_workers)
+        self._append(new_block)
+        if chain_metrics.ENABLED:
+            chain_metrics.record("block_production_seconds", time.perf_counter() - started, blocks_produced_total=1)
+
+    def get_mining_stats(self, height):
+        # Hashes tried, mining time and hash rate for a block mined in this session (or None)
+        return self.mining_stats.get(height)
 
     def is_chain_valid(self):
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i - 1]
+        # Full check of every block; see validate() for the detailed / incremental versions
+        return self.validate(full=True).valid
+
+    def validate(self, full=False, workers=1, chunk_size=VALIDATION_CHUNK_SIZE):
+        """
+        Check block hashes and links and return a ValidationResult listing every bad height.
+        full=False only checks blocks added after the last verified checkpoint.
+        full=True re-checks the whole chain (to catch tampering with already verified blocks),
+        spread over `workers` processes in chunks of chunk_size blocks (workers=None: all cores).
+        Blocks are read one chunk at a time; with a store, parallel workers read their own chunks.
+        """
+        started = time.perf_counter()
+        start = 1 if full else self.verified_height + 1
+        end = len(self.chain)
+        workers = workers or os.cpu_count() or 1
+        parallel = workers > 1 and end - start > chunk_size
 
-            if current.hash != current.calculate_hash():
-                print(f"Block {i} hash mismatch!")
-                return False
+        def chunks():
+            # Created lazily; each chunk also carries (or reads) the block before it for the first link
+            for first in range(start, end, chunk_size):
+                stop = min(first + chunk_size, end)
+                if parallel and self.store is not None:
+                    yield first, stop, self.store.path, self.difficulty
+                else:
+                    yield first, stop, self.chain[first - 1:stop], self.difficulty
 
-            if current.previous_hash != previous.hash:
-                print(f"Block {i} previous hash mismatch!")
-                return False
+        errors = []
 
-        return True
+        def collect(parts):
+            for chunk_errors, signed in parts:
+                errors.extend(chunk_errors)
+                # Signatures are checked here rather than in the workers: the verified cache lives in this process
+                errors.extend((height, "invalid signature") for height in self._invalid_signatures(signed))
+
+        if parallel:
+            from multiprocessing import Pool  # Imported here: only parallel audits need it
+
+            with Pool(workers) as pool:
+                # imap pulls chunks from the generator as workers take them, in order
+                collect(pool.imap(_validate_chunk, chunks()))
+        else:
+            collect(map(_validate_chunk, chunks()))
+        errors.sort(key=lambda error: error[0])  # Stable: keeps the per-block order of reasons
+
+        result = ValidationResult(errors)
+        # Blocks before the first bad one are now known good
+        first_bad = errors[0][0] if errors else end
+        if first_bad - 1 > self.verified_height:
+            self.verified_height = first_bad - 1
+        elif full and first_bad - 1 < self.verified_height:
+            self.verified_height = first_bad - 1  # A verified block was tampered with
+        if chain_metrics.ENABLED:
+            chain_metrics.record("validation_seconds", time.perf_counter() - started,
+                                 blocks_validated_total=max(end - start, 0), validation_errors_total=len(errors))
+        return result
 
 # Example usage
 if __name__ == "__main__":
@@ -83,6 +619,11 @@ if __name__ == "__main__":
 
     print("Is Blockchain valid?", my_chain.is_chain_valid())
 
+    # Tamper with block 1 and list every problem instead of stopping at the first one
+    my_chain.chain[1].merkle_root = build_merkle_root(["Alice pays Bob 100", "Bob pays Charlie 5"])
+    print("Validation after tampering:", my_chain.validate(full=True).errors)
+    my_chain.chain[1].merkle_root = build_merkle_root(my_chain.chain[1].transactions)
+
     for block in my_chain.chain:
         print(f"\nBlock {block.index}")
         print(f"Timestamp     : {block.timestamp}")
@@ -90,3 +631,25 @@ if __name__ == "__main__":
         print(f"Previous Hash : {block.previous_hash}")
         print(f"Current Hash  : {block.hash}")
         print(f"Transactions  : {block.transactions}")
+
+    # Inclusion proof straight from the chain, looked up by transaction hash
+    from merkle_proof import verify_transaction
+
+    tx = "Charlie pays Dave 2"
+    found = my_chain.get_transaction_proof(sha256(tx))
+    print(f"\n'{tx}' is in block {found['height']} at leaf {found['leaf_index']}; proof valid?",
+          verify_transaction(tx, found["proof"], found["merkle_root"]))
+
+    # Mined chain: every block carries a nonce that meets the difficulty target
+    mined_chain = Blockchain(difficulty=4)
+    mined_chain.add_block(["Alice pays Bob 10", "Bob pays Charlie 5"])
+    stats = mined_chain.get_mining_stats(1)
+    print(f"\nMined block 1 with nonce {mined_chain.chain[1].nonce}: {mined_chain.chain[1].hash}")
+    print(f"Mining took {stats['duration']:.3f}s at {stats['hash_rate']:.0f} hashes/sec")
+    print("Is mined Blockchain valid?", mined_chain.is_chain_valid())
+
+    # Growing a block one transaction at a time without rebuilding the tree
+    tree = IncrementalMerkleTree(["Alice pays Bob 10", "Bob pays Charlie 5"])
+    tree.append("Charlie pays Dave 2")
+    print("\nIncremental root matches full rebuild?",
+          tree.root() == build_merkle_root(["Alice pays Bob 10", "Bob pays Charlie 5", "Charlie pays Dave 2"]))
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# The RSA-PSS verifier lives with the other signature code in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+import chain_metrics  # noqa: E402
+from hashing_basics import generate_hash  # noqa: E402
+
+
+# -------------------------
+# Transaction: a payload signed by its sender
+# -------------------------
+class Transaction:
+    __slots__ = ("sender_public_key", "payload", "signature", "_encoded")
+
+    def __init__(self, sender_public_key, payload, signature):
+        """
+        sender_public_key: the sender's public key in PEM format (bytes)
+        payload: what the transaction says, e.g. "Alice pays Bob 10 BTC"
+        signature: RSA-PSS signature of the payload made with the sender's private key
+        """
+        self.sender_public_key = sender_public_key
+        self.payload = payload
+        self.signature = signature
+        self._encoded = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_encoded":
+            # A changed field changes the encoding and tx_hash, so a stale hash can never hit a cache
+            object.__setattr__(self, "_encoded", None)
+
+    @classmethod
+    def sign(cls, private_key, payload):
+        # Create a transaction signed with private_key (a cryptography RSA private key)
+        from cryptography.hazmat.primitives import serialization
+        from signature_verifier import PSS_PADDING, SIGNATURE_HASH
+
+        pem_public = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        with chain_metrics.timer("signature_sign_seconds", signatures_created_total=1):
+            signature = private_key.sign(payload.encode(), PSS_PADDING, SIGNATURE_HASH)
+        return cls(pem_public, payload, signature)
+
+    def to_dict(self):
+        return {
+            "sender": self.sender_public_key.decode(),
+            "payload": self.payload,
+            "signature": self.signature.hex(),
+        }
+
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(fields["sender"].encode(), fields["payload"], bytes.fromhex(fields["signature"]))
+
+    def encode(self):
+        """
+        Canonical bytes of the whole transaction (key, payload and signature).
+        Having encode() like a str lets the Merkle helpers hash transactions directly.
+        """
+        if self._encoded is None:
+            self._encoded = json.dumps(self.to_dict(), sort_keys=True).encode()
+        return self._encoded
+
+    @property
+    def tx_hash(self):
+        # Same value as the transaction's Merkle leaf hash
+        return generate_hash(self.encode())
+
+    def __repr__(self):
+        return f"Transaction({self.payload!r}, tx_hash={self.tx_hash[:16]}...)"
+
+
+# -------------------------
+# VerifiedSignatureCache: remembers which transactions already passed signature checks
+# -------------------------
+class VerifiedSignatureCache:
+    def __init__(self, max_size=100_000, verifier=None):
+        """
+        Bounded LRU set of tx hashes whose signatures verified. A transaction checked once
+        (e.g. when admitted to the mempool) is not RSA-verified again during block validation.
+        The tx hash covers the signature, so a re-signed or altered transaction is a cache miss.
+        Safe to share between threads: the mempool admits transactions on executor threads
+        while blocks are being added.
+        """
+        self.max_size = max_size
+        self._verified = OrderedDict()
+        self._verifier = verifier  # SignatureVerifier, created on first use
+        self._lock = threading.Lock()  # Guards _verified and the lazy creation of _verifier
+
+    def __contains__(self, tx_hash):
+        return tx_hash in self._verified
+
+    def __len__(self):
+        return len(self._verified)
+
+    def add(self, tx_hash):
+        with self._lock:
+            self._add(tx_hash)
+
+    def _add(self, tx_hash):
+        self._verified[tx_hash] = None
+        self._verified.move_to_end(tx_hash)
+        if len(self._verified) > self.max_size:
+            self._verified.popitem(last=False)  # Forget the least recently used transaction
+
+    def verify(self, transactions):
+        """
+        Check the signatures of a list of Transaction objects, one bool per transaction.
+        Cached transactions are accepted without RSA work; the rest are verified as one batch
+        and the valid ones are added to the cache.
+        """
+        results = [None] * len(transactions)
+        pending = []
+        hashes = [tx.tx_hash for tx in transactions]
+        with self._lock:
+            for i, tx_hash in enumerate(hashes):
+                if tx_hash in self._verified:
+                    self._verified.move_to_end(tx_hash)
+                    results[i] = True
+                else:
+                    pending.append(i)
+            if pending and self._verifier is None:
+                from signature_verifier import SignatureVerifier  # Loads the cryptography backend
+                self._verifier = SignatureVerifier()
+
+        if pending:
+            # RSA work runs outside the lock so other threads can use the cache meanwhile
+            checked = self._verifier.verify_batch(
+                (transactions[i].sender_public_key, transactions[i].payload.encode(), transactions[i].signature)
+                for i in pending
+            )
+            with self._lock:
+                for i, ok in zip(pending, checked):
+                    results[i] = ok
+                    if ok:
+                        self._add(hashes[i])
+        return results
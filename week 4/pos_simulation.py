@@ -1,29 +1,269 @@
 import random
 
-# Step 1: Define participants with their stake
-validators = {
-    "Alice": 50,   # 50% chance
-    "Bob": 30,     # 30% chance
-    "Charlie": 20  # 20% chance
-}
-
-# Step 2: Calculate total stake
-total_stake = sum(validators.values())
-
-# Step 3: Generate a random number between 1 and total_stake
-pick = random.randint(1, total_stake)
-
-# Step 4: Loop through validators and pick one based on weighted stake
-current = 0
-selected_validator = None
-
-for validator, stake in validators.items():
-    current += stake  # Increase cumulative weight
-    if pick <= current:
-        selected_validator = validator
-        break  # Stop the loop once a validator is selected
-
-# Step 5: Output result
-print("Validators and Stakes:", validators)
-print("Random Number Picked:", pick)
-print("Selected Validator for block creation:", selected_validator)
\ No newline at end of file
+# -------------------------
+# ValidatorSet: weighted validator selection for many validators
+# -------------------------
+class ValidatorSet:
+    """
+    Picks validators with probability proportional to stake, exactly like the cumulative
+    scan below (random number between 1 and total stake, first validator whose running
+    total reaches it), but stakes are kept in a Fenwick (binary indexed) tree:
+    changing a stake and picking a validator are both O(log n) instead of O(n).
+    Stakes must be whole numbers, as random.randint requires.
+    """
+
+    def __init__(self, validators=None):
+        self.names = []   # Validator names in insertion order (their position never changes)
+        self.stakes = []  # stakes[i] belongs to names[i]
+        self.positions = {}  # name -> position
+        self._tree = [0]  # Fenwick tree, 1-based: _tree[i] sums stakes[i - lowbit(i):i]
+        self.total_stake = 0
+        for name, stake in (validators or {}).items():
+            self.set_stake(name, stake)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def stake_of(self, name):
+        return self.stakes[self.positions[name]]
+
+    def _prefix_sum(self, i):
+        # Sum of the first i stakes
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def set_stake(self, name, stake):
+        """
+        Set a validator's stake, adding the validator if it is new. O(log n).
+        A stake of 0 keeps the validator in the set but it can never be picked.
+        """
+        if stake < 0 or stake != int(stake):
+            raise ValueError("stake must be a non-negative whole number")
+        stake = int(stake)
+
+        if name not in self.positions:
+            self.positions[name] = len(self.names)
+            self.names.append(name)
+            self.stakes.append(stake)
+            i = len(self.names)
+            # New tree node covers stakes (i - lowbit(i), i]: the new stake plus earlier ones
+            self._tree.append(stake + self._prefix_sum(i - 1) - self._prefix_sum(i - (i & -i)))
+            self.total_stake += stake
+            return
+
+        position = self.positions[name]
+        delta = stake - self.stakes[position]
+        self.stakes[position] = stake
+        self.total_stake += delta
+        i = position + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def add_stake(self, name, amount):
+        # Increase (or with a negative amount, decrease) a validator's stake
+        current = self.stake_of(name) if name in self.positions else 0
+        self.set_stake(name, current + amount)
+
+    def _find(self, pick):
+        # Position of the first validator whose cumulative stake is >= pick (1 <= pick <= total)
+        position = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] < pick:
+                position = nxt
+                pick -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def select(self, rng=random):
+        # Pick one validator weighted by stake; rng can be a seeded random.Random
+        if self.total_stake <= 0:
+            raise ValueError("no validator has any stake")
+        return self.names[self._find(rng.randint(1, self.total_stake))]
+
+    def select_many(self, count, seed=None):
+        """
+        Pick validators for `count` slots at once (with the same stakes for every slot).
+        Uses NumPy when it is installed: one cumulative sum plus a vectorized binary search,
+        so thousands of slots cost about as much as a single Python-level pick.
+        """
+        if self.total_stake <= 0:
+            raise ValueError("no validator has any stake")
+        try:
+            import numpy as np
+        except ImportError:
+            rng = random.Random(seed)
+            return [self.select(rng) for _ in range(count)]
+
+        rng = np.random.default_rng(seed)
+        cumulative = np.cumsum(np.asarray(self.stakes, dtype=np.int64))
+        picks = rng.integers(1, self.total_stake, size=count, endpoint=True)
+        # side="left": first position whose cumulative stake is >= pick, as in the linear scan
+        positions = np.searchsorted(cumulative, picks, side="left")
+        return [self.names[i] for i in positions]
+
+
+# -------------------------
+# EpochSimulator: long proof-of-stake runs with rewards and slashing
+# -------------------------
+class EpochSimulator:
+    """
+    Simulates many epochs of stake-weighted block proposal with NumPy.
+    Each epoch every slot picks a proposer exactly like ValidatorSet.select (same distribution),
+    then stakes are updated once: honest proposers earn block_reward per block, and a proposer
+    that misbehaves (probability slash_probability per block) loses slash_fraction of its stake.
+    The same seed always gives the same run.
+    """
+
+    def __init__(self, validators, slots_per_epoch=32, block_reward=1, slash_probability=0.0,
+                 slash_fraction=0.5, seed=None):
+        import numpy as np  # Required here: the simulator is vectorized end to end
+
+        if isinstance(validators, ValidatorSet):
+            validators = dict(zip(validators.names, validators.stakes))
+        self.np = np
+        self.names = list(validators)
+        # Stakes and rewards are whole numbers, as in ValidatorSet: the int64 arrays would truncate
+        # a fractional stake and cannot take a fractional reward
+        for name in self.names:
+            stake = validators[name]
+            if stake < 0 or stake != int(stake):
+                raise ValueError(f"stake of {name!r} must be a non-negative whole number")
+        if block_reward < 0 or block_reward != int(block_reward):
+            raise ValueError("block_reward must be a non-negative whole number")
+        block_reward = int(block_reward)
+        self.stakes = np.array([int(validators[name]) for name in self.names], dtype=np.int64)
+        self.slots_per_epoch = slots_per_epoch
+        self.block_reward = block_reward
+        self.slash_probability = slash_probability
+        self.slash_fraction = slash_fraction
+        self.rng = np.random.default_rng(seed)
+
+        self.epoch = 0
+        # Running per-validator statistics over every simulated slot
+        self.selections = np.zeros(len(self.names), dtype=np.int64)
+        self.expected_selections = np.zeros(len(self.names), dtype=np.float64)
+        self.rewards = np.zeros(len(self.names), dtype=np.int64)
+        self.slashings = np.zeros(len(self.names), dtype=np.int64)
+
+    def run_epoch(self):
+        np = self.np
+        total = int(self.stakes.sum())
+        if total <= 0:
+            raise ValueError("no validator has any stake")
+
+        # Draw every slot of the epoch at once: random number in 1..total, first cumulative >= it
+        picks = self.rng.integers(1, total, size=self.slots_per_epoch, endpoint=True)
+        proposers = np.searchsorted(np.cumsum(self.stakes), picks, side="left")
+        blocks = np.bincount(proposers, minlength=len(self.names))
+
+        self.selections += blocks
+        self.expected_selections += self.slots_per_epoch * self.stakes / total
+
+        # Misbehaving blocks earn nothing; a validator caught at least once is slashed once per epoch
+        if self.slash_probability:
+            bad_blocks = self.rng.binomial(blocks, self.slash_probability)
+        else:
+            bad_blocks = np.zeros_like(blocks)
+        reward = (blocks - bad_blocks) * self.block_reward
+        penalty = np.where(bad_blocks > 0, (self.stakes * self.slash_fraction).astype(np.int64), 0)
+
+        self.rewards += reward
+        self.slashings += bad_blocks > 0
+        self.stakes += reward - penalty
+        self.epoch += 1
+
+    def statistics(self):
+        """
+        Per-validator statistics so far: stake, stake fraction, selections, reward share and
+        the relative deviation of selections from what the stakes predicted.
+        Plus the Gini coefficient of current stakes (0 = equal, towards 1 = concentrated).
+        """
+        np = self.np
+        total_stake = self.stakes.sum()
+        total_rewards = self.rewards.sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = np.where(self.expected_selections > 0,
+                                 self.selections / self.expected_selections - 1.0, 0.0)
+
+        sorted_stakes = np.sort(self.stakes)
+        n = len(sorted_stakes)
+        ranks = np.arange(1, n + 1)
+        gini = float((2 * ranks - n - 1) @ sorted_stakes / (n * total_stake)) if total_stake else 0.0
+
+        return {
+            "epoch": self.epoch,
+            "slots": self.epoch * self.slots_per_epoch,
+            "total_stake": int(total_stake),
+            "gini": gini,
+            "validators": {
+                name: {
+                    "stake": int(self.stakes[i]),
+                    "stake_fraction": float(self.stakes[i] / total_stake) if total_stake else 0.0,
+                    "selections": int(self.selections[i]),
+                    "reward_share": float(self.rewards[i] / total_rewards) if total_rewards else 0.0,
+                    "selection_deviation": float(deviation[i]),
+                    "slashings": int(self.slashings[i]),
+                }
+                for i, name in enumerate(self.names)
+            },
+        }
+
+    def run(self, epochs, report_every=None):
+        """
+        Run `epochs` epochs, yielding statistics() every report_every epochs and after the last
+        one, so long runs can be watched (or written out) while they progress.
+        """
+        for done in range(1, epochs + 1):
+            self.run_epoch()
+            if done == epochs or (report_every and done % report_every == 0):
+                yield self.statistics()
+
+
+if __name__ == "__main__":
+    # Step 1: Define participants with their stake
+    validators = {
+        "Alice": 50,   # 50% chance
+        "Bob": 30,     # 30% chance
+        "Charlie": 20  # 20% chance
+    }
+
+    # Step 2: Calculate total stake
+    total_stake = sum(validators.values())
+
+    # Step 3: Generate a random number between 1 and total_stake
+    pick = random.randint(1, total_stake)
+
+    # Step 4: Loop through validators and pick one based on weighted stake
+    current = 0
+    selected_validator = None
+
+    for validator, stake in validators.items():
+        current += stake  # Increase cumulative weight
+        if pick <= current:
+            selected_validator = validator
+            break  # Stop the loop once a validator is selected
+
+    # Step 5: Output result
+    print("Validators and Stakes:", validators)
+    print("Random Number Picked:", pick)
+    print("Selected Validator for block creation:", selected_validator)
+
+    # Same pick with ValidatorSet: O(log n) per pick and per stake update
+    validator_set = ValidatorSet(validators)
+    print("ValidatorSet pick:", validator_set.select())
+    print("Next 10 slots:", validator_set.select_many(10))
+
+    # Many epochs with compounding rewards: do the richest validators pull ahead?
+    simulator = EpochSimulator(validators, slots_per_epoch=32, block_reward=1, slash_probability=0.01, seed=42)
+    for report in simulator.run(10_000, report_every=5_000):
+        shares = {name: round(stats["stake_fraction"], 3) for name, stats in report["validators"].items()}
+        print(f"After {report['slots']} slots: stake shares {shares}, Gini {report['gini']:.3f}")
@@ -1,34 +1,208 @@
-import hashlib  # Import hashlib for SHA-256 hashing
 import time     # Import time to measure duration
+import os       # Import os to count available CPU cores
+import sys      # Import sys to reach the shared hashing helpers
+
+# SHA-256 goes through the shared helpers in week 2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "week 2"))
+import chain_metrics  # noqa: E402
+from hashing_basics import new_hasher  # noqa: E402
+
+# Number of nonces handed to a worker at a time in parallel mode
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Within a chunk, workers check for a winner (and report their progress) this often
+CANCEL_CHECK_INTERVAL = 4096
+
+def difficulty_target(difficulty=None, difficulty_bits=None):
+    """
+    Turn a difficulty into the 32-byte target a raw digest must be below.
+    difficulty counts leading zero hex characters (4 bits each), as in the original check;
+    difficulty_bits counts leading zero bits, so it can be tuned in steps 4x finer.
+    """
+    if difficulty_bits is None:
+        difficulty_bits = 4 * difficulty
+    if not 0 <= difficulty_bits <= 256:
+        raise ValueError("difficulty_bits must be between 0 and 256")
+    # A digest has difficulty_bits leading zero bits exactly when it is < 2**(256 - bits).
+    # Comparing equal-length big-endian bytes orders them like the numbers they encode.
+    if difficulty_bits == 0:
+        return b"\xff" * 33  # Longer than any digest with the same prefix, so every hash qualifies
+    return (1 << (256 - difficulty_bits)).to_bytes(32, "big")
+
+def _prefix_hasher(data):
+    # Absorb the fixed block data once; each nonce then only hashes its own few bytes
+    if not isinstance(data, (str, bytes, bytearray, memoryview)):
+        data = str(data)  # Any other object is hashed as its text, like the original f"{data}{nonce}"
+    return new_hasher(data)
+
+def _scan_nonces(prefix, target, start, stop):
+    """
+    Try nonces in [start, stop) against a pre-absorbed prefix hasher.
+    Returns (nonce, hex_hash, hashes_tried); nonce/hash are None when nothing qualifies.
+    """
+    copy = prefix.copy  # Bind once: attribute lookups add up over millions of nonces
+    for nonce in range(start, stop):
+        h = copy()  # Clone the midstate instead of re-hashing the data
+        h.update(b"%d" % nonce)  # Same bytes as f"{data}{nonce}".encode() produced
+        if h.digest() < target:  # Test the raw digest, no hex formatting per attempt
+            return nonce, h.hexdigest(), nonce - start + 1
+    return None, None, stop - start
+
+def proof_of_work(data, difficulty, max_nonce=10**7, workers=1, stats=None, difficulty_bits=None):
+    # workers > 1 (or None = every core) switches to the parallel nonce search
+    if workers is None or workers > 1:
+        return parallel_proof_of_work(data, difficulty, max_nonce, workers=workers, stats=stats,
+                                      difficulty_bits=difficulty_bits)
 
-def proof_of_work(data, difficulty, max_nonce=10**7):
-    nonce = 0  # Start nonce at 0
     start_time = time.time()  # Record start time
-    
-    # Loop over nonce values from 0 up to max_nonce (to prevent infinite loop)
-    for nonce in range(max_nonce):
-        text = f"{data}{nonce}"  # Concatenate data and current nonce
-        hash_result = hashlib.sha256(text.encode()).hexdigest()  
-        # Compute SHA-256 hash of the concatenated string
-        
-        # Check if hash starts with required number of zeros for difficulty
-        if hash_result.startswith("0" * difficulty):
-            end_time = time.time()  # Record end time on success
-            return nonce, hash_result, end_time - start_time  # Return results
-    
-    # If loop finishes without finding valid nonce, raise error or return None
+    target = difficulty_target(difficulty, difficulty_bits)
+
+    # Hash data + nonce for nonces 0 up to max_nonce (to prevent infinite loop)
+    nonce, hash_result, tried = _scan_nonces(_prefix_hasher(data), target, 0, max_nonce)
+    duration = time.time() - start_time
+    _record_stats(stats, tried, duration, 1)
+
+    if nonce is not None:
+        return nonce, hash_result, duration  # Return results
+
+    # If no nonce met the target, return None
     return None, None, None
 
-# Difficulty of 4 means hash must start with '0000'
-difficulty = 4
+# -------------------------
+# Parallel mining: split the nonce space across a process pool
+# -------------------------
+
+# Set in every worker by _init_worker; once any worker finds a nonce the others stop early.
+# _hash_counter is a shared total of the nonces every worker actually scanned.
+_found_event = None
+_hash_counter = None
+
+def _init_worker(found_event, hash_counter):
+    global _found_event, _hash_counter
+    _found_event = found_event
+    _hash_counter = hash_counter
+
+def _search_nonce_range(args):
+    """
+    Scan nonces in [start, stop) and return (nonce, hash, hashes_tried).
+    nonce/hash are None when nothing in the range meets the target.
+    The range is scanned in pieces of CANCEL_CHECK_INTERVAL: after each piece the work done is
+    added to the shared counter and the scan stops if another worker has already won.
+    """
+    data, target, start, stop = args
+    prefix = _prefix_hasher(data)
+    tried = 0
+    for piece_start in range(start, stop, CANCEL_CHECK_INTERVAL):
+        # Another worker already won: stop without hashing the rest
+        if _found_event is not None and _found_event.is_set():
+            break
+        nonce, hash_result, piece_tried = _scan_nonces(prefix, target, piece_start,
+                                                       min(piece_start + CANCEL_CHECK_INTERVAL, stop))
+        tried += piece_tried
+        if _hash_counter is not None:
+            with _hash_counter.get_lock():
+                _hash_counter.value += piece_tried
+        if nonce is not None:
+            if _found_event is not None:
+                _found_event.set()  # Tell the other workers to stop
+            return nonce, hash_result, tried
+    return None, None, tried
+
+def parallel_proof_of_work(data, difficulty, max_nonce=10**7, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, stats=None,
+                           difficulty_bits=None):
+    """
+    Same search as proof_of_work, but nonce ranges of chunk_size are handed out to
+    a pool of worker processes (workers=None means one per CPU core).
+    Returns (nonce, hash, duration) like proof_of_work. The first winner found is
+    returned, which is not necessarily the lowest valid nonce.
+    If a stats dict is passed it is filled with hashes tried, hash rate and worker count.
+    """
+    import queue  # Imported here: only parallel mining needs these
+    from multiprocessing import Event, Pool, Value
+
+    workers = workers or os.cpu_count() or 1
+    target = difficulty_target(difficulty, difficulty_bits)
+
+    # Consecutive chunks of [0, max_nonce), so workers never hash the same nonce twice. They are
+    # created lazily: only about two per worker are in flight, however large max_nonce is
+    starts = iter(range(0, max_nonce, chunk_size))
+    window = 2 * workers
+
+    found_event = Event()
+    hash_counter = Value("Q", 0)  # Nonces scanned by all workers, including those stopped early
+    finished = queue.SimpleQueue()  # Chunk results (or worker exceptions) as they complete
+    result = (None, None, None)
+
+    with Pool(workers, initializer=_init_worker, initargs=(found_event, hash_counter)) as pool:
+        # Timed from here: the duration and hash rate describe the search, not process startup
+        start_time = time.time()
+
+        def submit():
+            start = next(starts, None)
+            if start is None:
+                return 0
+            pool.apply_async(_search_nonce_range, ((data, target, start, min(start + chunk_size, max_nonce)),),
+                             callback=finished.put, error_callback=finished.put)
+            return 1
+
+        in_flight = sum(submit() for _ in range(window))
+        while in_flight:
+            outcome = finished.get()
+            in_flight -= 1
+            if isinstance(outcome, BaseException):
+                raise outcome
+            nonce, hash_result, _ = outcome
+            if nonce is not None:
+                result = (nonce, hash_result, time.time() - start_time)
+                break
+            in_flight += submit()
+        # Stats are taken at the win, so both the duration and the hashes counted so far describe the
+        # search itself; workers add their count every CANCEL_CHECK_INTERVAL nonces, so at most one
+        # unfinished piece per worker is left out. The pool is then stopped without handing out the
+        # rest of the nonce space
+        found_event.set()
+        duration = time.time() - start_time
+        hashes_tried = hash_counter.value
+        pool.terminate()
+
+    _record_stats(stats, hashes_tried, duration, workers)
+    return result
+
+def _record_stats(stats, hashes_tried, duration, workers):
+    # Fill the caller's stats dict (if any) with the aggregate mining numbers
+    if chain_metrics.ENABLED:
+        chain_metrics.record("mining_seconds", duration, nonces_tried_total=hashes_tried, hashes_total=hashes_tried)
+    if stats is None:
+        return
+    stats["hashes"] = hashes_tried
+    stats["duration"] = duration
+    stats["hash_rate"] = hashes_tried / duration if duration > 0 else 0.0
+    stats["workers"] = workers
+
+if __name__ == "__main__":
+    # Difficulty of 4 means hash must start with '0000'
+    difficulty = 4
+
+    # Run proof of work with a max nonce limit (to avoid infinite running)
+    nonce, hash_val, duration = proof_of_work("Block Data", difficulty)
+
+    if nonce is not None:
+        print("Proof of Work successful!")
+        print("Nonce:", nonce)
+        print("Hash:", hash_val)
+        print("Time taken:", duration, "seconds")
+    else:
+        print("Failed to find a valid nonce within max attempts.")
 
-# Run proof of work with a max nonce limit (to avoid infinite running)
-nonce, hash_val, duration = proof_of_work("Block Data", difficulty)
+    # Same block mined across every CPU core
+    stats = {}
+    nonce, hash_val, duration = parallel_proof_of_work("Block Data", difficulty, stats=stats)
 
-if nonce is not None:
-    print("Proof of Work successful!")
-    print("Nonce:", nonce)
-    print("Hash:", hash_val)
-    print("Time taken:", duration, "seconds")
-else:
-    print("Failed to find a valid nonce within max attempts.")
+    if nonce is not None:
+        print("\nParallel Proof of Work successful!")
+        print("Nonce:", nonce)
+        print("Hash:", hash_val)
+        print("Time taken:", duration, "seconds")
+        print(f"Hash rate: {stats['hash_rate']:.0f} hashes/sec across {stats['workers']} workers")
+    else:
+        print("Parallel search failed to find a valid nonce within max attempts.")